@@ -153,18 +153,51 @@ def parse_qs_bytes(
     Keys still become type str (interpreted as latin1 in python3!)
     because it's too painful to keep them as byte strings in
     python3 and in practice they're nearly always ascii anyway.
+
+    .. versionchanged:: 6.2
+       Byte strings are split and unquoted directly instead of being
+       decoded, parsed with `urllib.parse.parse_qs` and re-encoded.
     """
-    # This is gross, but python3 doesn't give us another way.
-    # Latin1 is the universal donor of character encodings.
-    if isinstance(qs, bytes):
-        qs = qs.decode("latin1")
-    result = urllib.parse.parse_qs(
-        qs, keep_blank_values, strict_parsing, encoding="latin1", errors="strict"
-    )
-    encoded = {}
-    for k, v in result.items():
-        encoded[k] = [i.encode("latin1") for i in v]
-    return encoded
+    if isinstance(qs, str):
+        # This is gross, but python3 doesn't give us another way.
+        # Latin1 is the universal donor of character encodings.
+        result = urllib.parse.parse_qs(
+            qs, keep_blank_values, strict_parsing, encoding="latin1", errors="strict"
+        )
+        encoded = {}
+        for k, v in result.items():
+            encoded[k] = [i.encode("latin1") for i in v]
+        return encoded
+    # The same algorithm as urllib.parse.parse_qsl, on bytes. Unquoting
+    # bytes and then decoding the name as latin1 gives the same result as
+    # unquoting the latin1-decoded string.
+    arguments = {}  # type: Dict[str, List[bytes]]
+    if not qs:
+        return arguments
+    unquote = urllib.parse.unquote_to_bytes
+    for field in qs.split(b"&"):
+        if not field and not strict_parsing:
+            continue
+        name, eq, value = field.partition(b"=")
+        if not eq:
+            if strict_parsing:
+                raise ValueError("bad query field: %r" % (field.decode("latin1"),))
+            if not keep_blank_values:
+                continue
+        elif not value and not keep_blank_values:
+            continue
+        name = name.replace(b"+", b" ")
+        if b"%" in name:
+            name = unquote(name)
+        value = value.replace(b"+", b" ")
+        if b"%" in value:
+            value = unquote(value)
+        key = name.decode("latin1")
+        if key in arguments:
+            arguments[key].append(value)
+        else:
+            arguments[key] = [value]
+    return arguments
 
 
 _UTF8_TYPES = (bytes, type(None))
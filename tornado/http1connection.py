@@ -19,13 +19,18 @@
 """
 
 import asyncio
+import bisect
+from functools import lru_cache
 import logging
 import re
+import time
 import types
+import zlib
 
 from tornado.concurrent import (
     Future,
     future_add_done_callback,
+    future_set_exception_unless_cancelled,
     future_set_result_unless_cancelled,
 )
 from tornado.escape import native_str, utf8
@@ -36,7 +41,246 @@ from tornado.log import gen_log, app_log
 from tornado.util import GzipDecompressor
 
 
-from typing import cast, Optional, Type, Awaitable, Callable, Union, Tuple
+from typing import (
+    cast,
+    Optional,
+    Type,
+    Awaitable,
+    Callable,
+    Union,
+    Tuple,
+    BinaryIO,
+    List,
+    Any,
+    Dict,
+)
+
+# The end of a header block: an empty line, where either line ending may
+# be CRLF or a bare LF. The optional CR before the first LF only belongs
+# to the last header line, so searching for these two strings finds the
+# same end position as the regex ``\r?\n\r?\n``.
+_HEADERS_END = (b"\n\r\n", b"\n\n")
+
+
+# Response content types that compress_response applies to, in addition
+# to text/*.
+_COMPRESSIBLE_TYPES = frozenset(
+    [
+        "application/javascript",
+        "application/x-javascript",
+        "application/json",
+        "application/xml",
+    ]
+)
+
+
+def _accepts_gzip(accept_encoding: str) -> bool:
+    for coding in accept_encoding.split(","):
+        name, _, params = coding.partition(";")
+        if name.strip().lower() not in ("gzip", "x-gzip"):
+            continue
+        for param in params.split(";"):
+            key, _, value = param.partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    return float(value) > 0
+                except ValueError:
+                    return False
+        return True
+    return False
+
+
+class _DeflateDecompressor(object):
+    """Streaming decompressor for ``Content-Encoding: deflate``.
+
+    The encoding is specified as zlib-wrapped data, but some servers send
+    raw deflate streams instead; those are told apart by the two-byte zlib
+    header, which is buffered until it has arrived in full.
+    """
+
+    def __init__(self) -> None:
+        self.decompressobj = None  # type: Optional[zlib._Decompress]
+        self._header = b""
+
+    def decompress(self, value: bytes, max_length: int = 0) -> bytes:
+        if self.decompressobj is None:
+            self._header += value
+            if len(self._header) < 2:
+                return b""
+            value = self._header
+            self._header = b""
+            # RFC 1950: CM (the low nibble of CMF) is 8 for deflate, and
+            # CMF * 256 + FLG is a multiple of 31.
+            if value[0] & 0x0F == 8 and (value[0] << 8 | value[1]) % 31 == 0:
+                wbits = zlib.MAX_WBITS
+            else:
+                wbits = -zlib.MAX_WBITS
+            self.decompressobj = zlib.decompressobj(wbits)
+        return self.decompressobj.decompress(value, max_length)
+
+    @property
+    def unconsumed_tail(self) -> bytes:
+        if self.decompressobj is None:
+            return b""
+        return self.decompressobj.unconsumed_tail
+
+    def flush(self) -> bytes:
+        if self.decompressobj is None:
+            return b""
+        return self.decompressobj.flush()
+
+
+class _BoundedDecompressor(object):
+    """Adapts a decompressor with the `bz2.BZ2Decompressor` interface
+    (``max_length``, ``needs_input`` and ``eof``) to the
+    `zlib.decompressobj`-style interface used by `_GzipMessageDelegate`.
+
+    Such objects buffer unconsumed input internally, so ``unconsumed_tail``
+    is always empty and the remaining output is retrieved by calling
+    `decompress` again with no new data.
+    """
+
+    unconsumed_tail = b""
+
+    def __init__(self, decompressobj: Any) -> None:
+        self.decompressobj = decompressobj
+
+    def decompress(self, value: bytes, max_length: int = 0) -> bytes:
+        if self.decompressobj.eof:
+            return b""
+        if not value and self.decompressobj.needs_input:
+            return b""
+        return self.decompressobj.decompress(value, max_length or -1)
+
+    def flush(self) -> bytes:
+        return b""
+
+
+class _BrotliDecompressor(object):
+    """Adapts `brotli.Decompressor` to the `zlib.decompressobj`-style
+    interface used by `_GzipMessageDelegate`.
+
+    Requires brotli 1.1 or later, whose ``process`` method accepts an
+    ``output_buffer_limit``.
+    """
+
+    unconsumed_tail = b""
+
+    def __init__(self) -> None:
+        self.decompressobj = brotli.Decompressor()
+
+    def decompress(self, value: bytes, max_length: int = 0) -> bytes:
+        if self.decompressobj.is_finished():
+            return b""
+        if not value and self.decompressobj.can_accept_more_data():
+            return b""
+        return self.decompressobj.process(value, output_buffer_limit=max_length)
+
+    def flush(self) -> bytes:
+        return b""
+
+
+# Decompressor factories for the content-codings understood by
+# HTTP1ConnectionParameters(decompress=True), keyed by lower-cased coding
+# name. Each factory returns an object with the interface of
+# `.GzipDecompressor`, whose ``max_length`` argument bounds the amount of
+# output produced per call.
+_DECOMPRESSORS = {
+    "gzip": GzipDecompressor,
+    "x-gzip": GzipDecompressor,
+    "deflate": _DeflateDecompressor,
+}  # type: Dict[str, Callable[[], Any]]
+
+try:
+    import brotli  # type: ignore
+except ImportError:
+    pass
+else:
+    if hasattr(brotli, "Decompressor") and hasattr(
+        brotli.Decompressor, "can_accept_more_data"
+    ):
+        _DECOMPRESSORS["br"] = _BrotliDecompressor
+
+try:
+    from compression import zstd  # type: ignore
+except ImportError:
+    try:
+        from backports import zstd  # type: ignore
+    except ImportError:
+        zstd = None
+if zstd is not None:
+    _DECOMPRESSORS["zstd"] = lambda: _BoundedDecompressor(zstd.ZstdDecompressor())
+
+
+def register_decompressor(coding: str, factory: Callable[[], Any]) -> None:
+    """Registers a decompressor for the content-coding ``coding``.
+
+    ``factory`` is called with no arguments for each message using that
+    coding and must return an object with the interface of
+    `.GzipDecompressor`: ``decompress(value, max_length)``,
+    ``unconsumed_tail`` and ``flush()``. Decompressors whose input is
+    buffered internally should leave ``unconsumed_tail`` empty and return
+    any remaining output when `decompress` is called with empty input.
+
+    ``gzip`` and ``deflate`` are always supported; ``br`` and ``zstd``
+    are supported when the ``brotli`` package (1.1 or later) or the
+    ``compression.zstd`` module (or its ``backports.zstd`` backport) is
+    available.
+
+    .. versionadded:: 6.2
+    """
+    _DECOMPRESSORS[coding.lower()] = factory
+
+
+def supported_content_encodings() -> List[str]:
+    """Returns the content-codings that can be decompressed, in order of
+    preference, for use in an ``Accept-Encoding`` header.
+
+    .. versionadded:: 6.2
+    """
+    return [coding for coding in _DECOMPRESSORS if coding != "x-gzip"][::-1]
+
+
+# Status lines and a few static header lines (Server, Content-Type, ...)
+# repeat from one response to the next, so write_headers reuses their
+# encoded (and already validated) form.
+@lru_cache(256)
+def _encode_response_line(code: int, reason: str) -> bytes:
+    line = utf8("HTTP/1.1 %d %s" % (code, reason))
+    if b"\n" in line:
+        raise ValueError("Newline in header: " + repr(line))
+    return line
+
+
+def _format_header_line(name: str, value: str) -> bytes:
+    # TODO: headers are supposed to be of type str, but we still have some
+    # cases that let bytes slip through. Remove these native_str calls when
+    # those are fixed.
+    line = (native_str(name) + ": " + native_str(value)).encode("latin1")
+    if b"\n" in line:
+        raise ValueError("Newline in header: " + repr(line))
+    return line
+
+
+# Only headers whose values are shared between responses go through the
+# cache; per-response values (Set-Cookie, ETag, Content-Length, Date, ...)
+# would just evict the useful entries and keep things like session cookies
+# alive in the cache.
+_CACHED_HEADER_NAMES = frozenset(
+    [
+        "Access-Control-Allow-Origin",
+        "Cache-Control",
+        "Connection",
+        "Content-Encoding",
+        "Content-Type",
+        "Server",
+        "Transfer-Encoding",
+        "Vary",
+        "X-Content-Type-Options",
+        "X-Frame-Options",
+    ]
+)
+_encode_header_line = lru_cache(256)(_format_header_line)
 
 
 class _QuietException(Exception):
@@ -68,6 +312,142 @@ class _ExceptionLoggingContext(object):
             raise _QuietException
 
 
+class RequestTiming(object):
+    """Timestamps for the phases of one request on a server connection.
+
+    Each attribute holds a `time.monotonic` value, or ``None`` if the
+    request never reached that point (for example because the client
+    disconnected):
+
+    * ``started``: the connection began waiting for the request. On a
+      keep-alive connection this includes the idle time between requests.
+    * ``headers_read``: the complete header block has been read.
+    * ``headers_handled``: ``delegate.headers_received`` has returned
+      (and any awaitable it returned has resolved).
+    * ``body_read``: the whole body has been passed to the delegate.
+    * ``handler_finished``: ``delegate.finish`` has returned, or the
+      response was finished from within it.
+    * ``response_finished``: the application called
+      `HTTP1Connection.finish`.
+    * ``response_written``: the response has been flushed to the socket.
+
+    The timing of the request being served is available as
+    ``request.connection.timing`` when ``timing_stats`` is set in the
+    `.HTTP1ConnectionParameters`.
+
+    .. versionadded:: 6.2
+    """
+
+    def __init__(self) -> None:
+        self.started = time.monotonic()
+        self.headers_read = None  # type: Optional[float]
+        self.headers_handled = None  # type: Optional[float]
+        self.body_read = None  # type: Optional[float]
+        self.handler_finished = None  # type: Optional[float]
+        self.response_finished = None  # type: Optional[float]
+        self.response_written = None  # type: Optional[float]
+
+    def phases(self) -> Dict[str, Optional[float]]:
+        """Returns the duration of each phase in seconds.
+
+        The phases are ``header_wait`` (from ``started`` to
+        ``headers_read``), ``headers_received``, ``body_read``, ``finish``
+        (the call to ``delegate.finish``), ``response`` (until the
+        application finished its response), ``write`` (until the response
+        was flushed) and ``total`` (from ``headers_read`` to
+        ``response_written``, which excludes keep-alive idle time).
+        Phases whose endpoints were not both reached are ``None``.
+        """
+        marks = [
+            self.started,
+            self.headers_read,
+            self.headers_handled,
+            self.body_read,
+            self.handler_finished,
+            self.response_finished,
+            self.response_written,
+        ]
+        result = {}  # type: Dict[str, Optional[float]]
+        for i, name in enumerate(RequestTimingStats.PHASES[:-1]):
+            start, end = marks[i], marks[i + 1]
+            result[name] = None if start is None or end is None else end - start
+        if self.headers_read is None or self.response_written is None:
+            result["total"] = None
+        else:
+            result["total"] = self.response_written - self.headers_read
+        return result
+
+
+class RequestTimingStats(object):
+    """Aggregates `RequestTiming` records into per-phase histograms.
+
+    Pass an instance as ``timing_stats`` to `.HTTP1ConnectionParameters`
+    (or `.HTTPServer`) to time every request served with those parameters.
+    `record` is called once each response has been flushed; subclasses
+    may override it to export timings elsewhere.
+
+    ``buckets`` are the upper bounds, in seconds, of the histogram
+    buckets; durations above the last bound are counted in a final
+    overflow bucket.
+
+    .. versionadded:: 6.2
+    """
+
+    PHASES = (
+        "header_wait",
+        "headers_received",
+        "body_read",
+        "finish",
+        "response",
+        "write",
+        "total",
+    )
+
+    DEFAULT_BUCKETS = (
+        0.0001,
+        0.0005,
+        0.001,
+        0.005,
+        0.01,
+        0.05,
+        0.1,
+        0.5,
+        1.0,
+        5.0,
+        10.0,
+    )
+
+    def __init__(self, buckets: Optional[Tuple[float, ...]] = None) -> None:
+        self.buckets = tuple(sorted(buckets or self.DEFAULT_BUCKETS))
+        self.reset()
+
+    def record(self, timing: RequestTiming) -> None:
+        """Adds the durations of a completed request to the histograms."""
+        self.requests += 1
+        for phase, duration in timing.phases().items():
+            if duration is not None:
+                self.counts[phase][bisect.bisect_left(self.buckets, duration)] += 1
+                self.sums[phase] += duration
+
+    def histograms(self) -> Dict[str, List[Tuple[float, int]]]:
+        """Returns ``(upper_bound, count)`` pairs for each phase.
+
+        The overflow bucket's upper bound is ``float("inf")``.
+        """
+        bounds = self.buckets + (float("inf"),)
+        return {
+            phase: list(zip(bounds, counts)) for phase, counts in self.counts.items()
+        }
+
+    def reset(self) -> None:
+        """Clears all recorded timings."""
+        self.requests = 0
+        self.counts = {
+            phase: [0] * (len(self.buckets) + 1) for phase in self.PHASES
+        }  # type: Dict[str, List[int]]
+        self.sums = dict.fromkeys(self.PHASES, 0.0)  # type: Dict[str, float]
+
+
 class HTTP1ConnectionParameters(object):
     """Parameters for `.HTTP1Connection` and `.HTTP1ServerConnection`.
     """
@@ -81,6 +461,15 @@ class HTTP1ConnectionParameters(object):
         max_body_size: Optional[int] = None,
         body_timeout: Optional[float] = None,
         decompress: bool = False,
+        write_high_watermark: Optional[int] = None,
+        write_low_watermark: Optional[int] = None,
+        lazy_headers: bool = False,
+        pipelining: bool = False,
+        compress_response: bool = False,
+        compression_level: int = 6,
+        compression_min_length: int = 1024,
+        timing_stats: Optional[RequestTimingStats] = None,
+        adaptive_read_chunk_size: bool = False,
     ) -> None:
         """
         :arg bool no_keep_alive: If true, always close the connection after
@@ -92,6 +481,35 @@ class HTTP1ConnectionParameters(object):
         :arg float body_timeout: how long to wait while reading body (seconds)
         :arg bool decompress: if true, decode incoming
             ``Content-Encoding: gzip``
+        :arg int write_high_watermark: if set, `.HTTP1Connection.write`
+            returns a `.Future` that resolves as soon as the output buffer
+            is below this size, and otherwise only once it has drained to
+            ``write_low_watermark``, instead of waiting for each chunk to
+            be flushed
+        :arg int write_low_watermark: see ``write_high_watermark``
+            (default: a quarter of it)
+        :arg bool lazy_headers: if true, servers parse request headers
+            into a `.LazyHTTPHeaders`, which only decodes the headers
+            that are actually looked up
+        :arg bool pipelining: if true, `.HTTP1ServerConnection` starts
+            reading the next request on a keep-alive connection as soon as
+            the application has finished its response, instead of waiting
+            until the response has been flushed to the socket. Responses
+            are still sent in request order.
+        :arg bool compress_response: if true, server responses with a
+            textual ``Content-Type`` are gzipped on the fly for HTTP/1.1
+            clients that send ``Accept-Encoding: gzip``. Compressed
+            responses are always sent with chunked encoding
+        :arg int compression_level: zlib compression level (1-9)
+        :arg int compression_min_length: responses whose
+            ``Content-Length`` is smaller than this are not compressed
+        :arg timing_stats: a `RequestTimingStats`; if set, servers record
+            a `RequestTiming` for each request, available as
+            ``connection.timing`` while it is served
+        :arg bool adaptive_read_chunk_size: if true, turns on
+            `.BaseIOStream.set_adaptive_read_chunk_size` for the stream,
+            so that bulk uploads are read in larger chunks while idle
+            keep-alive connections go back to small reads
         """
         self.no_keep_alive = no_keep_alive
         self.chunk_size = chunk_size or 65536
@@ -100,6 +518,15 @@ class HTTP1ConnectionParameters(object):
         self.max_body_size = max_body_size
         self.body_timeout = body_timeout
         self.decompress = decompress
+        self.write_high_watermark = write_high_watermark
+        self.write_low_watermark = write_low_watermark
+        self.lazy_headers = lazy_headers
+        self.pipelining = pipelining
+        self.compress_response = compress_response
+        self.compression_level = compression_level
+        self.compression_min_length = compression_min_length
+        self.timing_stats = timing_stats
+        self.adaptive_read_chunk_size = adaptive_read_chunk_size
 
 
 class HTTP1Connection(httputil.HTTPConnection):
@@ -161,6 +588,29 @@ class HTTP1Connection(httputil.HTTPConnection):
         self._expected_content_remaining = None  # type: Optional[int]
         # A Future for our outgoing writes, returned by IOStream.write.
         self._pending_write = None  # type: Optional[Future[None]]
+        # True once write_file has been used; sendfile writes bypass the
+        # stream's write buffer, so later writes could overtake them.
+        self._wrote_file = False
+        # True if the stream was handed to the next pipelined request
+        # before our response was flushed.
+        self._pipelined = False
+        # Set by HTTP1ServerConnection when the previous request on this
+        # stream was pipelined: the final write of its response, which
+        # may still be in flight.
+        self._previous_write = None  # type: Optional[Future[None]]
+        # Set by HTTP1ServerConnection.drain: the connection must be
+        # closed after this request, and the response should say so.
+        self._draining = False
+        # Set while gzipping the response body (see compress_response).
+        self._compressor = None  # type: Optional[zlib._Compress]
+        # Phase timestamps for this request (see timing_stats).
+        self.timing = None  # type: Optional[RequestTiming]
+        if params.write_high_watermark is not None:
+            self.stream.set_write_watermarks(
+                params.write_high_watermark, params.write_low_watermark
+            )
+        if params.adaptive_read_chunk_size:
+            self.stream.set_adaptive_read_chunk_size(True)
 
     def read_response(self, delegate: httputil.HTTPMessageDelegate) -> Awaitable[bool]:
         """Read a single HTTP response.
@@ -179,14 +629,22 @@ class HTTP1Connection(httputil.HTTPConnection):
     # 读取 header 和body
     async def _read_message(self, delegate: httputil.HTTPMessageDelegate) -> bool:
         need_delegate_close = False
+        timing = None
+        if self.params.timing_stats is not None and not self.is_client:
+            timing = self.timing = RequestTiming()
         try:
             # 根据正则从缓存中读取数据到stream
-            header_future = self.stream.read_until_regex(
-                b"\r?\n\r?\n", max_bytes=self.params.max_header_size
+            # Equivalent to read_until_regex(b"\r?\n\r?\n"), but a plain
+            # substring search is much cheaper than the regex engine.
+            header_future = self.stream.read_until_any(
+                _HEADERS_END, max_bytes=self.params.max_header_size
             )
             if self.params.header_timeout is None:
                 header_data = await header_future
             else:
+                await self._wait_for_previous_response(
+                    gen.convert_yielded(header_future)
+                )
                 try:
                     # 读取head 数据
                     #TODO gen很重要
@@ -198,6 +656,8 @@ class HTTP1Connection(httputil.HTTPConnection):
                 except gen.TimeoutError:
                     self.close()
                     return False
+            if timing is not None:
+                timing.headers_read = time.monotonic()
             # 解析header 获取请求地址 和请求参数相关数据
             start_line_str, headers = self._parse_headers(header_data)
             if self.is_client:
@@ -214,8 +674,8 @@ class HTTP1Connection(httputil.HTTPConnection):
                 self._request_headers = headers
                 start_line = req_start_line
                 # 根据浏览器支持的http版本 等信息 判断是否属于长连接  keep-alive
-                self._disconnect_on_finish = not self._can_keep_alive(
-                    req_start_line, headers
+                self._disconnect_on_finish = self._draining or not (
+                    self._can_keep_alive(req_start_line, headers)
                 )
             need_delegate_close = True
             with _ExceptionLoggingContext(app_log):
@@ -223,6 +683,8 @@ class HTTP1Connection(httputil.HTTPConnection):
                 header_recv_future = delegate.headers_received(start_line, headers)
                 if header_recv_future is not None:
                     await header_recv_future
+            if timing is not None:
+                timing.headers_handled = time.monotonic()
             if self.stream is None:
                 # We've been detached.
                 need_delegate_close = False
@@ -263,6 +725,8 @@ class HTTP1Connection(httputil.HTTPConnection):
                     if self._body_timeout is None:
                         await body_future
                     else:
+                        body_future = gen.convert_yielded(body_future)
+                        await self._wait_for_previous_response(body_future)
                         try:
                             await gen.with_timeout(
                                 self.stream.io_loop.time() + self._body_timeout,
@@ -273,12 +737,16 @@ class HTTP1Connection(httputil.HTTPConnection):
                             gen_log.info("Timeout reading body from %s", self.context)
                             self.stream.close()
                             return False
+            if timing is not None:
+                timing.body_read = time.monotonic()
             self._read_finished = True
             if not self._write_finished or self.is_client:
                 need_delegate_close = False
                 with _ExceptionLoggingContext(app_log):
                     # 读取完head body 后 app 进行解析body 实行app 核心方法execute
                     delegate.finish()
+                if timing is not None and timing.handler_finished is None:
+                    timing.handler_finished = time.monotonic()
             # If we're waiting for the application to produce an asynchronous
             # response, and we're not detached, register a close callback
             # on the stream (we didn't need one while we were reading)
@@ -307,6 +775,18 @@ class HTTP1Connection(httputil.HTTPConnection):
             self._clear_callbacks()
         return True
 
+    async def _wait_for_previous_response(self, future: "Future[Any]") -> None:
+        """Waits until the previous (pipelined) response has been flushed,
+        or ``future`` has resolved.
+
+        Timeouts must not start before this: the client may not send the
+        next request until it has read the previous response, and closing
+        the stream would cut that response off.
+        """
+        previous = self._previous_write
+        if previous is not None and not previous.done() and not future.done():
+            await asyncio.wait([future, previous], return_when=asyncio.FIRST_COMPLETED)
+
     def _clear_callbacks(self) -> None:
         """Clears the callback attributes.
 
@@ -388,11 +868,88 @@ class HTTP1Connection(httputil.HTTPConnection):
         chunk: Optional[bytes] = None,
     ) -> "Future[None]":
         """Implements `.HTTPConnection.write_headers`."""
+        lines = self._format_headers(start_line, headers)
+        future = None
+        if self.stream.closed():
+            future = self._write_future = Future()
+            future.set_exception(iostream.StreamClosedError())
+            future.exception()
+        else:
+            future = self._write_future = Future()
+            # head写入 然后写 俩个回车 在写数据
+            # The first chunk of the body (if any) takes the place of the
+            # final empty string, so that one join builds the whole buffer.
+            lines.append(self._format_chunk(chunk) if chunk else b"")
+            # 最终数据写入到stream中
+            self._pending_write = self.stream.write(b"\r\n".join(lines))
+            future_add_done_callback(self._pending_write, self._on_write_complete)
+        return future
+
+    def write_response(
+        self,
+        start_line: Union[httputil.RequestStartLine, httputil.ResponseStartLine],
+        headers: httputil.HTTPHeaders,
+        body: bytes = b"",
+    ) -> "Future[None]":
+        """Implements `.HTTPConnection.write_response`.
+
+        The header block, the body and (for chunked responses) the
+        terminating chunk are sent as a single buffer.
+
+        .. versionadded:: 6.2
+        """
+        lines = self._format_headers(start_line, headers)
+        if self._expected_content_remaining is not None:
+            remaining = self._expected_content_remaining - len(body)
+            if remaining != 0:
+                # Close the stream now to stop further framing errors.
+                self.stream.close()
+                if remaining < 0:
+                    raise httputil.HTTPOutputError(
+                        "Tried to write more data than Content-Length"
+                    )
+                raise httputil.HTTPOutputError(
+                    "Tried to write %d bytes less than Content-Length" % remaining
+                )
+            self._expected_content_remaining = 0
+        if self._compressor is not None:
+            body = self._compressor.compress(body) + self._compressor.flush()
+            self._compressor = None
+        if self._chunking_output:
+            if body:
+                lines.append(utf8("%x" % len(body)))
+                lines.append(body)
+            lines.extend((b"0", b"", b""))
+            # The terminator is already part of this write; make sure
+            # finish() doesn't send another one.
+            self._chunking_output = False
+        else:
+            lines.append(body)
+        future = self._write_future = Future()
+        if self.stream.closed():
+            future.set_exception(iostream.StreamClosedError())
+            future.exception()
+        else:
+            self._pending_write = self.stream.write(b"\r\n".join(lines))
+            future_add_done_callback(self._pending_write, self._on_write_complete)
+        self.finish()
+        return future
+
+    def _format_headers(
+        self,
+        start_line: Union[httputil.RequestStartLine, httputil.ResponseStartLine],
+        headers: httputil.HTTPHeaders,
+    ) -> List[bytes]:
+        # Returns the encoded header block as a list of lines, ending
+        # with an empty line. Also decides on chunking and Content-Length.
         lines = []
         if self.is_client:
             assert isinstance(start_line, httputil.RequestStartLine)
             self._request_start_line = start_line
-            lines.append(utf8("%s %s HTTP/1.1" % (start_line[0], start_line[1])))
+            line = utf8("%s %s HTTP/1.1" % (start_line[0], start_line[1]))
+            if b"\n" in line:
+                raise ValueError("Newline in header: " + repr(line))
+            lines.append(line)
             # Client requests with a non-empty body must have either a
             # Content-Length or a Transfer-Encoding.
             self._chunking_output = (
@@ -409,7 +966,9 @@ class HTTP1Connection(httputil.HTTPConnection):
             assert self._request_headers is not None
             self._response_start_line = start_line
             # 写入http版本 请求状态码等
-            lines.append(utf8("HTTP/1.1 %d %s" % (start_line[1], start_line[2])))
+            lines.append(_encode_response_line(start_line[1], start_line[2]))
+            if self.params.compress_response:
+                headers = self._maybe_compress(start_line, headers)
             self._chunking_output = (
                 # TODO: should this use
                 # self._request_start_line.version or
@@ -428,6 +987,8 @@ class HTTP1Connection(httputil.HTTPConnection):
                 # but if they do, leave it alone.
                 and "Transfer-Encoding" not in headers
             )
+            if self._draining:
+                self._disconnect_on_finish = True
             # If connection to a 1.1 client will be closed, inform client
             if (
                 self._request_start_line.version == "HTTP/1.1"
@@ -438,6 +999,7 @@ class HTTP1Connection(httputil.HTTPConnection):
             if (
                 self._request_start_line.version == "HTTP/1.0"
                 and self._request_headers.get("Connection", "").lower() == "keep-alive"
+                and not self._draining
             ):
                 # 如果是1.0版本 connection 是keepalive 设置keepalive
                 headers["Connection"] = "Keep-Alive"
@@ -452,32 +1014,53 @@ class HTTP1Connection(httputil.HTTPConnection):
             self._expected_content_remaining = int(headers["Content-Length"])
         else:
             self._expected_content_remaining = None
-        # TODO: headers are supposed to be of type str, but we still have some
-        # cases that let bytes slip through. Remove these native_str calls when those
-        # are fixed.
         # 处理header 并存到lines列表
-        header_lines = (
-            native_str(n) + ": " + native_str(v) for n, v in headers.get_all()
-        )
-        lines.extend(line.encode("latin1") for line in header_lines)
-        for line in lines:
-            if b"\n" in line:
-                raise ValueError("Newline in header: " + repr(line))
-        future = None
-        if self.stream.closed():
-            future = self._write_future = Future()
-            future.set_exception(iostream.StreamClosedError())
-            future.exception()
+        for name, value in headers.get_all():
+            if name in _CACHED_HEADER_NAMES:
+                lines.append(_encode_header_line(name, value))
+            else:
+                lines.append(_format_header_line(name, value))
+        # An empty line ends the header block.
+        lines.append(b"")
+        return lines
+
+    def _maybe_compress(
+        self, start_line: httputil.ResponseStartLine, headers: httputil.HTTPHeaders
+    ) -> httputil.HTTPHeaders:
+        # Returns the headers to send: a copy of ``headers`` if they had to
+        # be changed, since they belong to the caller.
+        assert self._request_start_line is not None
+        assert self._request_headers is not None
+        if start_line.code in (204, 304) or start_line.code < 200:
+            # No body to compress, so nothing varies with Accept-Encoding.
+            return headers
+        ctype = headers.get("Content-Type", "").split(";")[0].strip()
+        if not (ctype.startswith("text/") or ctype in _COMPRESSIBLE_TYPES):
+            return headers
+        headers = headers.copy()
+        if "Vary" in headers:
+            headers["Vary"] += ", Accept-Encoding"
         else:
-            future = self._write_future = Future()
-            # head写入 然后写 俩个回车 在写数据
-            data = b"\r\n".join(lines) + b"\r\n\r\n"
-            if chunk:
-                data += self._format_chunk(chunk)
-            # 最终数据写入到stream中
-            self._pending_write = self.stream.write(data)
-            future_add_done_callback(self._pending_write, self._on_write_complete)
-        return future
+            headers["Vary"] = "Accept-Encoding"
+        if (
+            # Without a Content-Length, only chunked encoding can delimit
+            # the compressed body on a keep-alive connection.
+            self._request_start_line.version != "HTTP/1.1"
+            or self._request_start_line.method == "HEAD"
+            or "Content-Encoding" in headers
+            or "Transfer-Encoding" in headers
+            or not _accepts_gzip(self._request_headers.get("Accept-Encoding", ""))
+        ):
+            return headers
+        if "Content-Length" in headers:
+            if int(headers["Content-Length"]) < self.params.compression_min_length:
+                return headers
+            del headers["Content-Length"]
+        headers["Content-Encoding"] = "gzip"
+        self._compressor = zlib.compressobj(
+            self.params.compression_level, zlib.DEFLATED, 16 + zlib.MAX_WBITS
+        )
+        return headers
 
     def _format_chunk(self, chunk: bytes) -> bytes:
         if self._expected_content_remaining is not None:
@@ -488,6 +1071,13 @@ class HTTP1Connection(httputil.HTTPConnection):
                 raise httputil.HTTPOutputError(
                     "Tried to write more data than Content-Length"
                 )
+        if self._compressor is not None and chunk:
+            # Flush on every write, as web.GZipContentEncoding does, so that
+            # streamed responses (e.g. server-sent events) reach the client
+            # right away instead of sitting in the compressor.
+            chunk = self._compressor.compress(chunk) + self._compressor.flush(
+                zlib.Z_SYNC_FLUSH
+            )
         if self._chunking_output and chunk:
             # Don't write out empty chunks because that means END-OF-STREAM
             # with chunked encoding
@@ -507,6 +1097,17 @@ class HTTP1Connection(httputil.HTTPConnection):
             future = self._write_future = Future()
             self._write_future.set_exception(iostream.StreamClosedError())
             self._write_future.exception()
+        elif self.params.write_high_watermark is not None:
+            # Let the producer run ahead of the socket until the stream's
+            # buffer goes over the high watermark, then pause it until
+            # the buffer has drained to the low watermark.
+            self._pending_write = self.stream.write(self._format_chunk(chunk))
+            future_add_done_callback(self._pending_write, self._on_write_complete)
+            if self.stream.write_buffer_above_high_watermark():
+                future = self.stream.drain()
+            else:
+                future = Future()
+                future.set_result(None)
         else:
             future = self._write_future = Future()
             # body 写入stream 中
@@ -515,6 +1116,89 @@ class HTTP1Connection(httputil.HTTPConnection):
             future_add_done_callback(self._pending_write, self._on_write_complete)
         return future
 
+    def write_file(
+        self, fileobj: BinaryIO, offset: int = 0, count: Optional[int] = None
+    ) -> "Future[None]":
+        """Writes ``count`` bytes of ``fileobj``, starting at ``offset``, as
+        part of the message body.
+
+        Like `write`, but the data is sent with `.IOStream.sendfile` so
+        it never has to be read into memory on plain sockets. If
+        ``count`` is None, everything from ``offset`` to the end of the
+        file is written. ``Content-Length`` and chunked framing are
+        applied as for `write`.
+
+        The returned `.Future` must resolve before `write`, `write_file`
+        or `finish` is called again.
+
+        .. versionadded:: 6.2
+        """
+        if count is None:
+            count = iostream._remaining_file_size(fileobj, offset)
+        self._wrote_file = True
+        future = self._write_future = Future()
+        if self.stream.closed():
+            future.set_exception(iostream.StreamClosedError())
+            future.exception()
+            return future
+        if self._expected_content_remaining is not None:
+            self._expected_content_remaining -= count
+            if self._expected_content_remaining < 0:
+                # Close the stream now to stop further framing errors.
+                self.stream.close()
+                raise httputil.HTTPOutputError(
+                    "Tried to write more data than Content-Length"
+                )
+        self._pending_write = gen.convert_yielded(
+            self._write_file(fileobj, offset, count)
+        )
+        future_add_done_callback(
+            self._pending_write, lambda f: self._on_file_written(future, f)
+        )
+        return future
+
+    def _on_file_written(
+        self, write_future: "Future[None]", future: "Future[None]"
+    ) -> None:
+        exc = future.exception()
+        if exc is None or isinstance(exc, iostream.StreamClosedError):
+            self._on_write_complete(future)
+            return
+        # Unlike a failed write, a short file is the application's error:
+        # report it through the Future it is waiting on. (The stream has
+        # been closed, which may already have cleared _write_future.)
+        self._write_callback = None
+        if self._write_future is write_future:
+            self._write_future = None
+        future_set_exception_unless_cancelled(write_future, exc)
+
+    async def _write_file(self, fileobj: BinaryIO, offset: int, count: int) -> None:
+        if self._compressor is not None:
+            # The file has to pass through the compressor, so sendfile
+            # can't be used.
+            fileobj.seek(offset)
+            while count > 0:
+                chunk = fileobj.read(min(count, self.params.chunk_size))
+                if not chunk:
+                    break
+                count -= len(chunk)
+                await self.stream.write(self._format_chunk(chunk))
+            if count:
+                self.stream.close()
+                raise httputil.HTTPOutputError("File ended %d bytes early" % count)
+            return
+        if self._chunking_output and count:
+            self.stream.write(utf8("%x" % count) + b"\r\n")
+        sent = await self.stream.sendfile(fileobj, offset, count)
+        if sent != count:
+            # The file was truncated after the size was announced.
+            self.stream.close()
+            raise httputil.HTTPOutputError(
+                "File ended %d bytes early" % (count - sent)
+            )
+        if self._chunking_output and count:
+            await self.stream.write(b"\r\n")
+
     def finish(self) -> None:
         """Implements `.HTTPConnection.finish`."""
         if (
@@ -529,9 +1213,22 @@ class HTTP1Connection(httputil.HTTPConnection):
             )
         if self._chunking_output:
             if not self.stream.closed():
-                self._pending_write = self.stream.write(b"0\r\n\r\n")
+                trailer = b"0\r\n\r\n"
+                if self._compressor is not None:
+                    # Send whatever the compressor still holds, plus the
+                    # gzip trailer, as the last data chunk.
+                    data = self._compressor.flush()
+                    self._compressor = None
+                    trailer = self._format_chunk(data) + trailer
+                self._pending_write = self.stream.write(trailer)
                 self._pending_write.add_done_callback(self._on_write_complete)
         self._write_finished = True
+        if self.timing is not None:
+            self.timing.response_finished = time.monotonic()
+            if self._read_finished and self.timing.handler_finished is None:
+                # We're inside delegate.finish, and the timing may be
+                # recorded before it returns.
+                self.timing.handler_finished = self.timing.response_finished
         # If the app finished the request while we're still reading,
         # divert any remaining data away from the delegate and
         # close the connection when we're done sending our response.
@@ -545,6 +1242,18 @@ class HTTP1Connection(httputil.HTTPConnection):
         if self._pending_write is None:
             self._finish_request(None)
         else:
+            if (
+                self.params.pipelining
+                and not self.is_client
+                and not self._disconnect_on_finish
+                and not self._draining
+                and not self._wrote_file
+            ):
+                # The whole response is queued in the stream's write
+                # buffer, so anything the next request writes will go out
+                # after it; let the server read that request right away.
+                self._pipelined = True
+                future_set_result_unless_cancelled(self._finish_future, None)
             future_add_done_callback(self._pending_write, self._finish_request)
 
     def _on_write_complete(self, future: "Future[None]") -> None:
@@ -582,6 +1291,12 @@ class HTTP1Connection(httputil.HTTPConnection):
         return False
 
     def _finish_request(self, future: "Optional[Future[None]]") -> None:
+        if self.timing is not None and self.timing.response_written is None:
+            self.timing.response_written = time.monotonic()
+            self.params.timing_stats.record(self.timing)  # type: ignore
+        if self._pipelined:
+            # The stream already belongs to the next request.
+            return
         self._clear_callbacks()
         if not self.is_client and self._disconnect_on_finish:
             self.close()
@@ -597,11 +1312,16 @@ class HTTP1Connection(httputil.HTTPConnection):
         # insert between messages of a reused connection.  Per RFC 7230,
         # we SHOULD ignore at least one empty line before the request.
         # http://tools.ietf.org/html/rfc7230#section-3.5
-        data_str = native_str(data.decode("latin1")).lstrip("\r\n")
+        data = data.lstrip(b"\r\n")
         # RFC 7230 section allows for both CRLF and bare LF.
-        eol = data_str.find("\n")
-        start_line = data_str[:eol].rstrip("\r")
-        headers = httputil.HTTPHeaders.parse(data_str[eol:])
+        eol = data.find(b"\n")
+        start_line = native_str(data[:eol].decode("latin1")).rstrip("\r")
+        if self.params.lazy_headers and not self.is_client:
+            headers = httputil.LazyHTTPHeaders.parse_bytes(
+                data[eol:]
+            )  # type: httputil.HTTPHeaders
+        else:
+            headers = httputil.HTTPHeaders.parse_bytes(data[eol:])
         return start_line, headers
 
     def _read_body(
@@ -674,16 +1394,32 @@ class HTTP1Connection(httputil.HTTPConnection):
                 with _ExceptionLoggingContext(app_log):
                     ret = delegate.data_received(body)
                     if ret is not None:
-                        await ret
+                        # Stop reading while the delegate is busy so that
+                        # a slow consumer throttles the sender through TCP
+                        # instead of the body piling up in our buffers.
+                        self.stream.pause_reading()
+                        try:
+                            await ret
+                        finally:
+                            self.stream.resume_reading()
 
     async def _read_chunked_body(self, delegate: httputil.HTTPMessageDelegate) -> None:
         # TODO: "chunk extensions" http://tools.ietf.org/html/rfc2616#section-3.6.1
+        # Chunks that are already in the stream's read buffer are decoded
+        # synchronously with the read_*_nowait methods; we only create a
+        # Future (and wait for the IOLoop) when we run out of buffered data,
+        # so a body made of many small chunks is handled in few iterations.
+        stream = self.stream
         total_size = 0
         while True:
-            chunk_len_str = await self.stream.read_until(b"\r\n", max_bytes=64)
+            chunk_len_str = stream.read_until_nowait(b"\r\n", max_bytes=64)
+            if chunk_len_str is None:
+                chunk_len_str = await stream.read_until(b"\r\n", max_bytes=64)
             chunk_len = int(chunk_len_str.strip(), 16)
             if chunk_len == 0:
-                crlf = await self.stream.read_bytes(2)
+                crlf = stream.read_bytes_nowait(2)
+                if crlf is None:
+                    crlf = await stream.read_bytes(2)
                 if crlf != b"\r\n":
                     raise httputil.HTTPInputError(
                         "improperly terminated chunked request"
@@ -694,9 +1430,10 @@ class HTTP1Connection(httputil.HTTPConnection):
                 raise httputil.HTTPInputError("chunked body too large")
             bytes_to_read = chunk_len
             while bytes_to_read:
-                chunk = await self.stream.read_bytes(
-                    min(bytes_to_read, self.params.chunk_size), partial=True
-                )
+                size = min(bytes_to_read, self.params.chunk_size)
+                chunk = stream.read_bytes_nowait(size, partial=True)
+                if chunk is None:
+                    chunk = await stream.read_bytes(size, partial=True)
                 bytes_to_read -= len(chunk)
                 if not self._write_finished or self.is_client:
                     with _ExceptionLoggingContext(app_log):
@@ -704,7 +1441,9 @@ class HTTP1Connection(httputil.HTTPConnection):
                         if ret is not None:
                             await ret
             # chunk ends with \r\n
-            crlf = await self.stream.read_bytes(2)
+            crlf = stream.read_bytes_nowait(2)
+            if crlf is None:
+                crlf = await stream.read_bytes(2)
             assert crlf == b"\r\n"
 
     async def _read_body_until_close(
@@ -719,21 +1458,25 @@ class HTTP1Connection(httputil.HTTPConnection):
 
 
 class _GzipMessageDelegate(httputil.HTTPMessageDelegate):
-    """Wraps an `HTTPMessageDelegate` to decode ``Content-Encoding: gzip``.
+    """Wraps an `HTTPMessageDelegate` to decode the body according to its
+    ``Content-Encoding``, using the decompressors in ``_DECOMPRESSORS``.
     """
 
     def __init__(self, delegate: httputil.HTTPMessageDelegate, chunk_size: int) -> None:
         self._delegate = delegate
         self._chunk_size = chunk_size
-        self._decompressor = None  # type: Optional[GzipDecompressor]
+        self._decompressor = None  # type: Any
 
     def headers_received(
         self,
         start_line: Union[httputil.RequestStartLine, httputil.ResponseStartLine],
         headers: httputil.HTTPHeaders,
     ) -> Optional[Awaitable[None]]:
-        if headers.get("Content-Encoding") == "gzip":
-            self._decompressor = GzipDecompressor()
+        factory = _DECOMPRESSORS.get(
+            headers.get("Content-Encoding", "").strip().lower()
+        )
+        if factory is not None:
+            self._decompressor = factory()
             # Downstream delegates will only see uncompressed data,
             # so rename the content-encoding header.
             # (but note that curl_httpclient doesn't do this).
@@ -744,7 +1487,7 @@ class _GzipMessageDelegate(httputil.HTTPMessageDelegate):
     async def data_received(self, chunk: bytes) -> None:
         if self._decompressor:
             compressed_data = chunk
-            while compressed_data:
+            while True:
                 decompressed = self._decompressor.decompress(
                     compressed_data, self._chunk_size
                 )
@@ -753,6 +1496,10 @@ class _GzipMessageDelegate(httputil.HTTPMessageDelegate):
                     if ret is not None:
                         await ret
                 compressed_data = self._decompressor.unconsumed_tail
+                # A full chunk of output may mean that the decompressor
+                # is holding more, even when all the input was consumed.
+                if not compressed_data and len(decompressed) < self._chunk_size:
+                    break
         else:
             ret = self._delegate.data_received(chunk)
             if ret is not None:
@@ -798,6 +1545,9 @@ class HTTP1ServerConnection(object):
         self.params = params
         self.context = context
         self._serving_future = None  # type: Optional[Future[None]]
+        self._draining = False
+        # The connection for the request being read or served.
+        self._request_conn = None  # type: Optional[HTTP1Connection]
 
     async def close(self) -> None:
         """Closes the connection.
@@ -813,6 +1563,50 @@ class HTTP1ServerConnection(object):
         except Exception:
             pass
 
+    async def drain(self) -> None:
+        """Closes the connection once the request in progress is done.
+
+        If the connection is waiting for a request that has not started to
+        arrive, it is closed as soon as any (pipelined) response still in
+        its write buffer has been sent. Otherwise the current request is
+        served to completion, its response is sent with ``Connection:
+        close`` (unless its headers were already written), and the
+        connection is closed afterwards.
+
+        Returns a `.Future` that resolves after the serving loop has exited.
+
+        .. versionadded:: 6.2
+        """
+        self._draining = True
+        conn = self._request_conn
+        if conn is not None:
+            conn._draining = True
+            await self._wait_for_writes()
+            # A request may have started to arrive while we waited.
+            conn = self._request_conn
+        if conn is None or (
+            conn._request_start_line is None and not self.stream.read_buffer_size()
+        ):
+            self.stream.close()
+        assert self._serving_future is not None
+        try:
+            await self._serving_future
+        except Exception:
+            pass
+
+    async def _wait_for_writes(self) -> None:
+        """Waits until everything queued on the stream has been written.
+
+        With pipelining, a response can still be in the write buffer after
+        its request is done; closing the stream would cut it off.
+        """
+        if self.stream.writing():
+            try:
+                # Resolves once all previously queued data is written.
+                await self.stream.write(b"")
+            except iostream.StreamClosedError:
+                pass
+
     def start_serving(self, delegate: httputil.HTTPServerConnectionDelegate) -> None:
         """Starts serving requests on this connection.
 
@@ -827,9 +1621,19 @@ class HTTP1ServerConnection(object):
     async def _server_request_loop(
         self, delegate: httputil.HTTPServerConnectionDelegate
     ) -> None:
+        previous_write = None  # type: Optional[Future[None]]
         try:
             while True:
+                if self._draining:
+                    await self._wait_for_writes()
+                    self.stream.close()
+                    return
+                # Waiting for the next request: don't keep a read chunk size
+                # grown for the previous one (see adaptive_read_chunk_size).
+                self.stream.reset_read_chunk_size()
                 conn = HTTP1Connection(self.stream, False, self.params, self.context)
+                conn._previous_write = previous_write
+                self._request_conn = conn
                 request_delegate = delegate.start_request(self, conn)
                 try:
                     ret = await conn.read_response(request_delegate)
@@ -849,6 +1653,8 @@ class HTTP1ServerConnection(object):
                     return
                 if not ret:
                     return
+                previous_write = conn._pending_write if conn._pipelined else None
                 await asyncio.sleep(0)
         finally:
+            self._request_conn = None
             delegate.on_close(self)
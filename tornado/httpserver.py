@@ -25,14 +25,25 @@ class except to start a server at the beginning of the process
    to `tornado.httputil.HTTPServerRequest`.  The old name remains as an alias.
 """
 
+import collections
+import multiprocessing
+import os
+import signal
 import socket
 import ssl
 
 from tornado.escape import native_str
-from tornado.http1connection import HTTP1ServerConnection, HTTP1ConnectionParameters
+from tornado import gen
+from tornado.http1connection import (
+    HTTP1ServerConnection,
+    HTTP1ConnectionParameters,
+    RequestTimingStats,
+)
 from tornado import httputil
 from tornado import iostream
 from tornado import netutil
+from tornado.ioloop import IOLoop
+from tornado.log import gen_log
 from tornado.tcpserver import TCPServer
 from tornado.util import Configurable
 
@@ -139,6 +150,19 @@ class HTTPServer(TCPServer, Configurable, httputil.HTTPServerConnectionDelegate)
 
     .. versionchanged:: 5.0
        The ``io_loop`` argument has been removed.
+
+    .. versionchanged:: 6.2
+       Added the ``write_high_watermark``, ``write_low_watermark``,
+       ``lazy_headers``, ``pipelining``, ``compress_response``,
+       ``compression_level``, ``compression_min_length``,
+       ``timing_stats`` and ``adaptive_read_chunk_size`` arguments
+       (see `.HTTP1ConnectionParameters`). Added the
+       ``zero_copy_uploads`` and ``upload_spill_threshold`` arguments,
+       which are passed to `.parse_multipart_form_data` as ``zero_copy``
+       and ``spill_threshold`` when the request callback is a plain
+       function. Added the ``max_connections`` argument; see
+       `ConnectionManager`. The server's manager is available as
+       ``connection_manager``.
     """
 
     def __init__(self, *args: Any, **kwargs: Any) -> None:
@@ -167,6 +191,18 @@ class HTTPServer(TCPServer, Configurable, httputil.HTTPServerConnectionDelegate)
         max_body_size: Optional[int] = None,
         max_buffer_size: Optional[int] = None,
         trusted_downstream: Optional[List[str]] = None,
+        write_high_watermark: Optional[int] = None,
+        write_low_watermark: Optional[int] = None,
+        lazy_headers: bool = False,
+        pipelining: bool = False,
+        compress_response: bool = False,
+        compression_level: int = 6,
+        compression_min_length: int = 1024,
+        timing_stats: Optional[RequestTimingStats] = None,
+        zero_copy_uploads: bool = False,
+        upload_spill_threshold: Optional[int] = None,
+        max_connections: Optional[int] = None,
+        adaptive_read_chunk_size: bool = False,
     ) -> None:
         # This method's signature is not extracted with autodoc
         # because we want its arguments to appear on the class
@@ -183,6 +219,15 @@ class HTTPServer(TCPServer, Configurable, httputil.HTTPServerConnectionDelegate)
             max_body_size=max_body_size,
             body_timeout=body_timeout,
             no_keep_alive=no_keep_alive,
+            write_high_watermark=write_high_watermark,
+            write_low_watermark=write_low_watermark,
+            lazy_headers=lazy_headers,
+            pipelining=pipelining,
+            compress_response=compress_response,
+            compression_level=compression_level,
+            compression_min_length=compression_min_length,
+            timing_stats=timing_stats,
+            adaptive_read_chunk_size=adaptive_read_chunk_size,
         )
         TCPServer.__init__(
             self,
@@ -191,7 +236,11 @@ class HTTPServer(TCPServer, Configurable, httputil.HTTPServerConnectionDelegate)
             read_chunk_size=chunk_size,
         )
         self._connections = set()  # type: Set[HTTP1ServerConnection]
+        self.connection_manager = ConnectionManager(max_connections)
+        self._draining = False
         self.trusted_downstream = trusted_downstream
+        self.zero_copy_uploads = zero_copy_uploads
+        self.upload_spill_threshold = upload_spill_threshold
 
     @classmethod
     def configurable_base(cls) -> Type[Configurable]:
@@ -220,6 +269,36 @@ class HTTPServer(TCPServer, Configurable, httputil.HTTPServerConnectionDelegate)
             conn = next(iter(self._connections))
             await conn.close()
 
+    async def drain(self, timeout: Optional[float] = None) -> None:
+        """Shuts the server down gracefully.
+
+        Stops accepting connections (see `~.TCPServer.stop`) and closes
+        idle keep-alive connections right away. Requests in progress are
+        allowed to finish; their responses are sent with ``Connection:
+        close`` and their connections are closed afterwards. After
+        ``timeout`` seconds (if given), any connections that are still
+        open are closed with `close_all_connections`.
+
+        Unlike `close_all_connections`, this lets clients and proxies see
+        that they must not reuse their connection instead of having
+        requests fail mid-flight.
+
+        Note that this method is a coroutine and must be called with ``await``.
+
+        .. versionadded:: 6.2
+        """
+        self._draining = True
+        self.stop()
+        draining = gen.multi([conn.drain() for conn in list(self._connections)])
+        try:
+            if timeout is None:
+                await draining
+            else:
+                await gen.with_timeout(IOLoop.current().time() + timeout, draining)
+        except gen.TimeoutError:
+            pass
+        await self.close_all_connections()
+
     # tcpServer handle_stream 具体实现，用于构造connection 处理每个用户的连接
     def handle_stream(self, stream: iostream.IOStream, address: Tuple) -> None:
         context = _HTTPRequestContext(
@@ -227,24 +306,276 @@ class HTTPServer(TCPServer, Configurable, httputil.HTTPServerConnectionDelegate)
         )
         # 创建conn 对象 处理 于客户端请求的连接
         conn = HTTP1ServerConnection(stream, self.conn_params, context)
+        if self._draining or not self.connection_manager.add(conn):
+            stream.close()
+            return
         self._connections.add(conn)
         conn.start_serving(self)
 
     def start_request(
         self, server_conn: object, request_conn: httputil.HTTPConnection
     ) -> httputil.HTTPMessageDelegate:
+        manager = self.connection_manager
+        if manager.max_connections is not None:
+            # The connection is idle until the next request's headers
+            # have arrived.
+            manager.mark_idle(server_conn)
         if isinstance(self.request_callback, httputil.HTTPServerConnectionDelegate):
             delegate = self.request_callback.start_request(server_conn, request_conn)
         else:
-            delegate = _CallableAdapter(self.request_callback, request_conn)
+            delegate = _CallableAdapter(
+                self.request_callback,
+                request_conn,
+                zero_copy=self.zero_copy_uploads,
+                spill_threshold=self.upload_spill_threshold,
+            )
 
         if self.xheaders:
             delegate = _ProxyAdapter(delegate, request_conn)
 
+        if manager.max_connections is not None:
+            delegate = _ActivityAdapter(delegate, manager, server_conn)
+
         return delegate
 
     def on_close(self, server_conn: object) -> None:
         self._connections.remove(typing.cast(HTTP1ServerConnection, server_conn))
+        self.connection_manager.remove(server_conn)
+
+
+class ConnectionManager(object):
+    """Tracks the open connections of an `HTTPServer` and enforces a
+    limit on how many may be open at once.
+
+    When a new connection would exceed ``max_connections``, the
+    keep-alive connection that has been idle the longest is closed to
+    make room. A connection is idle while it waits for its next request;
+    it is not evicted if part of that request has already arrived or a
+    response is still being written. If no connection can be evicted,
+    the new connection is closed instead. With ``max_connections=None``
+    connections are only counted.
+
+    Counters:
+
+    * ``open``: connections currently open
+    * ``idle``: connections currently waiting for a request (only
+      tracked when ``max_connections`` is set)
+    * ``evicted``: idle connections closed to make room
+    * ``rejected``: new connections closed because nothing could be
+      evicted
+
+    Connections that stay idle are still closed by the server's
+    ``idle_connection_timeout``.
+
+    .. versionadded:: 6.2
+    """
+
+    def __init__(self, max_connections: Optional[int] = None) -> None:
+        if max_connections is not None and max_connections < 1:
+            raise ValueError("max_connections must be at least 1")
+        self.max_connections = max_connections
+        self.open = 0
+        self.evicted = 0
+        self.rejected = 0
+        # Idle connections, least recently idle first.
+        self._idle = (
+            collections.OrderedDict()
+        )  # type: collections.OrderedDict[object, None]
+        # Evicted connections that have not called remove() yet; they no
+        # longer count as open.
+        self._closing = set()  # type: Set[object]
+
+    @property
+    def idle(self) -> int:
+        return len(self._idle)
+
+    def add(self, conn: HTTP1ServerConnection) -> bool:
+        """Registers a new connection.
+
+        Returns False if the connection should be refused because the
+        limit has been reached and no idle connection could be closed.
+        """
+        if self.max_connections is not None and self.open >= self.max_connections:
+            if not self._evict():
+                self.rejected += 1
+                return False
+        self.open += 1
+        return True
+
+    def remove(self, conn: object) -> None:
+        """Unregisters a closed connection."""
+        self._idle.pop(conn, None)
+        if conn in self._closing:
+            self._closing.remove(conn)
+        else:
+            self.open -= 1
+
+    def mark_idle(self, conn: object) -> None:
+        """Records that ``conn`` is waiting for its next request."""
+        self._idle[conn] = None
+        self._idle.move_to_end(conn)
+
+    def mark_active(self, conn: object) -> None:
+        """Records that ``conn`` has started receiving a request."""
+        self._idle.pop(conn, None)
+
+    def _evict(self) -> bool:
+        for conn in self._idle:
+            stream = typing.cast(HTTP1ServerConnection, conn).stream
+            if stream.writing() or stream.read_buffer_size():
+                # Still flushing a (pipelined) response, or the next
+                # request has started to arrive.
+                continue
+            del self._idle[conn]
+            # The connection's serving loop will exit and call on_close
+            # (and so remove()) later.
+            stream.close()
+            self._closing.add(conn)
+            self.open -= 1
+            self.evicted += 1
+            return True
+        return False
+
+
+class PreforkSupervisor(object):
+    """Runs an `HTTPServer` in several worker processes on one port.
+
+    Each worker binds its own listening socket with ``SO_REUSEPORT``
+    (see `.bind_sockets`), so the kernel spreads new connections across
+    the workers instead of letting them all compete for a single accept
+    queue. ``server_factory`` is called in each worker to create the
+    `HTTPServer`; the parent process only supervises::
+
+        def make_server():
+            return HTTPServer(app)
+
+        supervisor = PreforkSupervisor(make_server, 8888)
+        supervisor.run()
+
+    Workers that exit abnormally are restarted, up to ``max_restarts``
+    times in total. ``num_processes`` defaults to the number of CPUs.
+
+    Like ``fork_processes``, `run` must be called before any `.IOLoop`
+    is created in the parent process.
+
+    .. versionadded:: 6.2
+    """
+
+    def __init__(
+        self,
+        server_factory: Callable[[], HTTPServer],
+        port: int,
+        address: Optional[str] = None,
+        num_processes: Optional[int] = None,
+        max_restarts: int = 100,
+    ) -> None:
+        if num_processes is None or num_processes <= 0:
+            num_processes = os.cpu_count() or 1
+        self.server_factory = server_factory
+        self.port = port
+        self.address = address
+        self.num_processes = num_processes
+        self.max_restarts = max_restarts
+        self.restarts = 0
+        # One slot per worker, written only by that worker.
+        self._request_counts = multiprocessing.Array("Q", num_processes, lock=False)
+        self._children = {}  # type: Dict[int, int]
+        self._stopping = False
+
+    def request_counts(self) -> List[int]:
+        """Returns the number of requests started by each worker.
+
+        Counts survive worker restarts.
+        """
+        return list(self._request_counts)
+
+    def run(self) -> None:
+        """Starts the workers and supervises them until `stop` is called
+        or every worker has exited cleanly.
+        """
+        for task_id in range(self.num_processes):
+            self._spawn(task_id)
+        while self._children:
+            try:
+                pid, status = os.wait()
+            except InterruptedError:
+                continue
+            except ChildProcessError:
+                break
+            if pid not in self._children:
+                continue
+            task_id = self._children.pop(pid)
+            if self._stopping:
+                continue
+            if os.WIFSIGNALED(status):
+                gen_log.warning(
+                    "child %d (pid %d) killed by signal %d, restarting",
+                    task_id,
+                    pid,
+                    os.WTERMSIG(status),
+                )
+            elif os.WEXITSTATUS(status) != 0:
+                gen_log.warning(
+                    "child %d (pid %d) exited with status %d, restarting",
+                    task_id,
+                    pid,
+                    os.WEXITSTATUS(status),
+                )
+            else:
+                gen_log.info("child %d (pid %d) exited normally", task_id, pid)
+                continue
+            self.restarts += 1
+            if self.restarts > self.max_restarts:
+                self.stop()
+                raise RuntimeError("Too many child restarts, giving up")
+            self._spawn(task_id)
+
+    def stop(self, sig: int = signal.SIGTERM) -> None:
+        """Stops restarting workers and sends ``sig`` (default SIGTERM)
+        to the running ones.
+
+        Safe to call from a signal handler in the parent process.
+        """
+        self._stopping = True
+        for pid in list(self._children):
+            try:
+                os.kill(pid, sig)
+            except ProcessLookupError:
+                pass
+
+    def _spawn(self, task_id: int) -> None:
+        pid = os.fork()
+        if pid:
+            self._children[pid] = task_id
+            return
+        # In the child: never return into the supervisor loop, not even
+        # on KeyboardInterrupt or SystemExit.
+        status = 1
+        try:
+            self._run_worker(task_id)
+            status = 0
+        except Exception:
+            gen_log.error("Uncaught exception in worker %d", task_id, exc_info=True)
+        finally:
+            os._exit(status)
+
+    def _run_worker(self, task_id: int) -> None:
+        self._children = {}
+        sockets = netutil.bind_sockets(self.port, self.address, reuse_port=True)
+        server = self.server_factory()
+        counts = self._request_counts
+        start_request = server.start_request
+
+        def counting_start_request(
+            server_conn: object, request_conn: httputil.HTTPConnection
+        ) -> httputil.HTTPMessageDelegate:
+            return _CountingAdapter(
+                start_request(server_conn, request_conn), counts, task_id
+            )
+
+        server.start_request = counting_start_request  # type: ignore
+        server.add_sockets(sockets)
+        IOLoop.current().start()
 
 
 class _CallableAdapter(httputil.HTTPMessageDelegate):
@@ -252,9 +583,13 @@ class _CallableAdapter(httputil.HTTPMessageDelegate):
         self,
         request_callback: Callable[[httputil.HTTPServerRequest], None],
         request_conn: httputil.HTTPConnection,
+        zero_copy: bool = False,
+        spill_threshold: Optional[int] = None,
     ) -> None:
         self.connection = request_conn
         self.request_callback = request_callback
+        self.zero_copy = zero_copy
+        self.spill_threshold = spill_threshold
         self.request = None  # type: Optional[httputil.HTTPServerRequest]
         self.delegate = None
         self._chunks = []  # type: List[bytes]
@@ -278,7 +613,9 @@ class _CallableAdapter(httputil.HTTPMessageDelegate):
     def finish(self) -> None:
         assert self.request is not None
         self.request.body = b"".join(self._chunks)
-        self.request._parse_body()
+        self.request._parse_body(
+            zero_copy=self.zero_copy, spill_threshold=self.spill_threshold
+        )
         self.request_callback(self.request)
 
     def on_connection_close(self) -> None:
@@ -363,6 +700,66 @@ class _HTTPRequestContext(object):
         self.protocol = self._orig_protocol
 
 
+class _CountingAdapter(httputil.HTTPMessageDelegate):
+    """Counts the requests whose headers were received in ``counts[index]``."""
+
+    def __init__(
+        self, delegate: httputil.HTTPMessageDelegate, counts: Any, index: int
+    ) -> None:
+        self.delegate = delegate
+        self.counts = counts
+        self.index = index
+
+    def headers_received(
+        self,
+        start_line: Union[httputil.RequestStartLine, httputil.ResponseStartLine],
+        headers: httputil.HTTPHeaders,
+    ) -> Optional[Awaitable[None]]:
+        self.counts[self.index] += 1
+        return self.delegate.headers_received(start_line, headers)
+
+    def data_received(self, chunk: bytes) -> Optional[Awaitable[None]]:
+        return self.delegate.data_received(chunk)
+
+    def finish(self) -> None:
+        self.delegate.finish()
+
+    def on_connection_close(self) -> None:
+        self.delegate.on_connection_close()
+
+
+class _ActivityAdapter(httputil.HTTPMessageDelegate):
+    """Marks the connection as active in a `ConnectionManager` once a
+    request's headers have been received."""
+
+    def __init__(
+        self,
+        delegate: httputil.HTTPMessageDelegate,
+        manager: ConnectionManager,
+        server_conn: object,
+    ) -> None:
+        self.delegate = delegate
+        self.manager = manager
+        self.server_conn = server_conn
+
+    def headers_received(
+        self,
+        start_line: Union[httputil.RequestStartLine, httputil.ResponseStartLine],
+        headers: httputil.HTTPHeaders,
+    ) -> Optional[Awaitable[None]]:
+        self.manager.mark_active(self.server_conn)
+        return self.delegate.headers_received(start_line, headers)
+
+    def data_received(self, chunk: bytes) -> Optional[Awaitable[None]]:
+        return self.delegate.data_received(chunk)
+
+    def finish(self) -> None:
+        self.delegate.finish()
+
+    def on_connection_close(self) -> None:
+        self.delegate.on_connection_close()
+
+
 class _ProxyAdapter(httputil.HTTPMessageDelegate):
     def __init__(
         self,
@@ -27,8 +27,11 @@ import email.utils
 from functools import lru_cache
 from http.client import responses
 import http.cookies
+import io
 import re
 from ssl import SSLError
+import sys
+import tempfile
 import time
 import unicodedata
 from urllib.parse import urlencode, urlparse, urlunparse, parse_qsl
@@ -73,6 +76,18 @@ def _normalize_header(name: str) -> str:
     return "-".join([w.capitalize() for w in name.split("-")])
 
 
+@lru_cache(1000)
+def _normalize_header_bytes(name: bytes) -> str:
+    # Header names repeat on every request, so intern the normalized
+    # form to share one string object among all parsed headers.
+    return sys.intern(_normalize_header(name.decode("latin1")))
+
+
+# The bytes that str.isspace() accepts after a latin1 decode, so that
+# parse_bytes strips and detects continuation lines exactly like parse.
+_HEADER_WHITESPACE = bytes(i for i in range(256) if chr(i).isspace())
+
+
 class HTTPHeaders(collections.abc.MutableMapping):
     """A dictionary that maintains ``Http-Header-Case`` for all keys.
 
@@ -120,7 +135,12 @@ class HTTPHeaders(collections.abc.MutableMapping):
 
     def __init__(self, *args: typing.Any, **kwargs: str) -> None:  # noqa: F811
         self._dict = {}  # type: typing.Dict[str, str]
-        self._as_list = {}  # type: typing.Dict[str, typing.List[str]]
+        # None while the per-name value lists have not been built from
+        # _pairs yet (see parse_bytes and the _as_list property).
+        self._as_list_dict = (
+            {}
+        )  # type: Optional[typing.Dict[str, typing.List[str]]]
+        self._pairs = []  # type: List[Tuple[str, str]]
         self._last_key = None  # type: Optional[str]
         if len(args) == 1 and len(kwargs) == 0 and isinstance(args[0], HTTPHeaders):
             # Copy constructor
@@ -130,6 +150,19 @@ class HTTPHeaders(collections.abc.MutableMapping):
             # Dict-style initialization
             self.update(*args, **kwargs)
 
+    @property
+    def _as_list(self) -> typing.Dict[str, typing.List[str]]:
+        as_list = self._as_list_dict
+        if as_list is None:
+            as_list = self._as_list_dict = {}
+            for name, value in self._pairs:
+                if name in as_list:
+                    as_list[name].append(value)
+                else:
+                    as_list[name] = [value]
+            self._pairs = []
+        return as_list
+
     # new public methods
 
     def add(self, name: str, value: str) -> None:
@@ -205,6 +238,56 @@ class HTTPHeaders(collections.abc.MutableMapping):
                 h.parse_line(line)
         return h
 
+    @classmethod
+    def parse_bytes(cls, headers: bytes) -> "HTTPHeaders":
+        """Returns a dictionary from an HTTP header block in bytes.
+
+        Equivalent to ``parse(headers.decode("latin1"))``, but done in a
+        single pass over the bytes. The lists returned by `get_list` and
+        `get_all` are only built when one of them is first used.
+
+        >>> h = HTTPHeaders.parse_bytes(b"A: 1\\r\\nA: 2\\r\\n")
+        >>> h["a"]
+        '1,2'
+        >>> h.get_list("a")
+        ['1', '2']
+
+        .. versionadded:: 6.2
+        """
+        h = cls()
+        d = h._dict
+        pairs = h._pairs
+        name = None  # type: Optional[str]
+        for line in headers.split(b"\n"):
+            if line.endswith(b"\r"):
+                line = line[:-1]
+            if not line:
+                continue
+            if line[0] in _HEADER_WHITESPACE:
+                # continuation of a multi-line header
+                if name is None:
+                    raise HTTPInputError(
+                        "first header line cannot start with whitespace"
+                    )
+                new_part = " " + line.lstrip(_HEADER_WHITESPACE).decode("latin1")
+                pairs[-1] = (name, pairs[-1][1] + new_part)
+                d[name] += new_part
+                continue
+            colon = line.find(b":")
+            if colon < 0:
+                raise HTTPInputError("no colon in header line")
+            name = _normalize_header_bytes(line[:colon])
+            value = line[colon + 1 :].strip(_HEADER_WHITESPACE).decode("latin1")
+            pairs.append((name, value))
+            if name in d:
+                d[name] = d[name] + "," + value
+            else:
+                d[name] = value
+        h._last_key = name
+        if pairs:
+            h._as_list_dict = None
+        return h
+
     # MutableMapping abstract method implementations.
 
     def __setitem__(self, name: str, value: str) -> None:
@@ -244,6 +327,169 @@ class HTTPHeaders(collections.abc.MutableMapping):
     __unicode__ = __str__
 
 
+class LazyHTTPHeaders(HTTPHeaders):
+    """An `HTTPHeaders` that parses individual headers on demand.
+
+    `parse_bytes` validates the header block but otherwise only keeps a
+    reference to it. Looking up a header with ``headers[name]``, ``in``
+    or ``get`` searches the block for that name alone; any other use
+    (iteration, `get_list`, `get_all`, mutation) parses the whole block
+    first, after which the object behaves exactly like `HTTPHeaders`.
+
+    This is cheaper than `HTTPHeaders.parse_bytes` when a request
+    handler only looks at a few of the headers it receives.
+
+    .. versionadded:: 6.2
+    """
+
+    _raw = None  # type: Optional[bytes]
+    _lower = b""
+
+    def __init__(self, *args: typing.Any, **kwargs: str) -> None:
+        # Names looked up in _raw so far, with their values.
+        self._values = {}  # type: Dict[str, List[str]]
+        super(LazyHTTPHeaders, self).__init__(*args, **kwargs)
+
+    @classmethod
+    def parse_bytes(cls, headers: bytes) -> "LazyHTTPHeaders":
+        try:
+            headers.decode("ascii")
+        except UnicodeDecodeError:
+            # Header name lookups below rely on ASCII case folding.
+            return typing.cast(
+                LazyHTTPHeaders, super(LazyHTTPHeaders, cls).parse_bytes(headers)
+            )
+        # Reject the same malformed blocks as HTTPHeaders.parse_bytes.
+        lines = headers.split(b"\n")
+        for line in lines:
+            if line.endswith(b"\r"):
+                line = line[:-1]
+            if line:
+                if line[0] in _HEADER_WHITESPACE:
+                    raise HTTPInputError(
+                        "first header line cannot start with whitespace"
+                    )
+                break
+        for line in [line for line in lines if b":" not in line]:
+            if line.endswith(b"\r"):
+                line = line[:-1]
+            if line and line[0] not in _HEADER_WHITESPACE:
+                raise HTTPInputError("no colon in header line")
+        # HTTPHeaders.__init__ is skipped: until _materialize runs, only
+        # the attributes below are used.
+        h = cls.__new__(cls)
+        h._raw = headers
+        h._lower = b"\n" + headers.lower()
+        h._values = {}
+        return h
+
+    def _find(self, norm_name: str) -> List[str]:
+        values = self._values.get(norm_name)
+        if values is not None:
+            return values
+        raw = self._raw
+        assert raw is not None
+        values = self._values[norm_name] = []
+        try:
+            key = b"\n" + norm_name.lower().encode("latin1") + b":"
+        except UnicodeEncodeError:
+            return values
+        if key[1:2] and key[1] in _HEADER_WHITESPACE:
+            # Such a line would be a continuation, not a header.
+            return values
+        lower = self._lower
+        pos = lower.find(key)
+        while pos >= 0:
+            # _lower has an extra leading newline, so this is the offset
+            # in raw of the first byte after the colon.
+            start = pos + len(key) - 1
+            end = raw.find(b"\n", start)
+            if end < 0:
+                end = len(raw)
+            value = raw[start:end].strip(_HEADER_WHITESPACE).decode("latin1")
+            while end + 1 < len(raw) and raw[end + 1] in _HEADER_WHITESPACE:
+                next_end = raw.find(b"\n", end + 1)
+                if next_end < 0:
+                    next_end = len(raw)
+                line = raw[end + 1 : next_end]
+                if line.endswith(b"\r"):
+                    line = line[:-1]
+                if line:
+                    # continuation of a multi-line header
+                    value += " " + line.lstrip(_HEADER_WHITESPACE).decode("latin1")
+                end = next_end
+            values.append(value)
+            pos = lower.find(key, end)
+        return values
+
+    def _materialize(self) -> None:
+        raw = self._raw
+        if raw is None:
+            return
+        self._raw = None
+        self._lower = b""
+        self._values = {}
+        h = HTTPHeaders.parse_bytes(raw)
+        self._dict = h._dict
+        self._as_list_dict = h._as_list_dict
+        self._pairs = h._pairs
+        self._last_key = h._last_key
+
+    def __getitem__(self, name: str) -> str:
+        if self._raw is None:
+            return super(LazyHTTPHeaders, self).__getitem__(name)
+        norm_name = _normalize_header(name)
+        values = self._find(norm_name)
+        if not values:
+            raise KeyError(norm_name)
+        return ",".join(values)
+
+    def __contains__(self, name: object) -> bool:
+        if self._raw is None:
+            return super(LazyHTTPHeaders, self).__contains__(name)
+        return isinstance(name, str) and bool(self._find(_normalize_header(name)))
+
+    def add(self, name: str, value: str) -> None:
+        self._materialize()
+        super(LazyHTTPHeaders, self).add(name, value)
+
+    def get_list(self, name: str) -> List[str]:
+        self._materialize()
+        return super(LazyHTTPHeaders, self).get_list(name)
+
+    def get_all(self) -> Iterable[Tuple[str, str]]:
+        self._materialize()
+        return super(LazyHTTPHeaders, self).get_all()
+
+    def parse_line(self, line: str) -> None:
+        self._materialize()
+        super(LazyHTTPHeaders, self).parse_line(line)
+
+    def __setitem__(self, name: str, value: str) -> None:
+        self._materialize()
+        super(LazyHTTPHeaders, self).__setitem__(name, value)
+
+    def __delitem__(self, name: str) -> None:
+        self._materialize()
+        super(LazyHTTPHeaders, self).__delitem__(name)
+
+    def __len__(self) -> int:
+        self._materialize()
+        return super(LazyHTTPHeaders, self).__len__()
+
+    def __bool__(self) -> bool:
+        # Without this, truth testing would go through __len__ and parse
+        # everything. A block that is not blank has at least one header
+        # (parse_bytes has rejected lines that aren't headers).
+        if self._raw is not None:
+            return bool(self._raw.strip())
+        return super(LazyHTTPHeaders, self).__len__() > 0
+
+    def __iter__(self) -> Iterator[typing.Any]:
+        self._materialize()
+        return super(LazyHTTPHeaders, self).__iter__()
+
+
 class HTTPServerRequest(object):
     """A single HTTP request.
 
@@ -361,7 +607,7 @@ class HTTPServerRequest(object):
         self.method = method
         self.uri = uri
         self.version = version
-        self.headers = headers or HTTPHeaders()
+        self.headers = headers if headers is not None else HTTPHeaders()
         self.body = body or b""
 
         # set remote IP and protocol
@@ -392,18 +638,14 @@ class HTTPServerRequest(object):
             )  # type: http.cookies.SimpleCookie
             if "Cookie" in self.headers:
                 try:
-                    parsed = parse_cookie(self.headers["Cookie"])
+                    parsed = _parse_cookie_morsels(self.headers["Cookie"])
                 except Exception:
                     pass
                 else:
-                    for k, v in parsed.items():
-                        try:
-                            self._cookies[k] = v
-                        except Exception:
-                            # SimpleCookie imposes some restrictions on keys;
-                            # parse_cookie does not. Discard any cookies
-                            # with disallowed keys.
-                            pass
+                    # The parsed morsels may be cached and shared with
+                    # other requests, so hand out copies.
+                    for k, morsel in parsed.items():
+                        self._cookies[k] = morsel.copy()
         return self._cookies
 
     def full_url(self) -> str:
@@ -448,13 +690,21 @@ class HTTPServerRequest(object):
         except SSLError:
             return None
 
-    def _parse_body(self) -> None:
+    def _parse_body(
+        self,
+        zero_copy: bool = False,
+        spill_threshold: Optional[int] = None,
+        tempdir: Optional[str] = None,
+    ) -> None:
         parse_body_arguments(
             self.headers.get("Content-Type", ""),
             self.body,
             self.body_arguments,
             self.files,
             self.headers,
+            zero_copy=zero_copy,
+            spill_threshold=spill_threshold,
+            tempdir=tempdir,
         )
 
         for k, v in self.body_arguments.items():
@@ -601,6 +851,26 @@ class HTTPConnection(object):
         """
         raise NotImplementedError()
 
+    def write_response(
+        self,
+        start_line: Union["RequestStartLine", "ResponseStartLine"],
+        headers: HTTPHeaders,
+        body: bytes = b"",
+    ) -> "Future[None]":
+        """Writes a complete message: headers, the whole body, and finish.
+
+        Equivalent to ``write_headers(start_line, headers, body)``
+        followed by `finish`, which is what this default implementation
+        does. Implementations may send everything in a single write.
+
+        Returns a future for flow control.
+
+        .. versionadded:: 6.2
+        """
+        future = self.write_headers(start_line, headers, body)
+        self.finish()
+        return future
+
     def finish(self) -> None:
         """Indicates that the last body data has been written.
         """
@@ -654,6 +924,62 @@ def url_concat(
     return url
 
 
+class _MemoryViewReader(io.RawIOBase):
+    """A read-only, seekable file object over a `memoryview`.
+
+    Unlike `io.BytesIO`, which copies anything but a `bytes` object,
+    this only copies the parts that are actually read.
+    """
+
+    def __init__(self, view: memoryview) -> None:
+        self._view = view
+        self._pos = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._pos
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_CUR:
+            offset += self._pos
+        elif whence == io.SEEK_END:
+            offset += len(self._view)
+        elif whence != io.SEEK_SET:
+            raise ValueError("invalid whence (%r)" % whence)
+        if offset < 0:
+            raise ValueError("negative seek position %r" % offset)
+        self._pos = offset
+        return offset
+
+    def read(self, size: Optional[int] = -1) -> bytes:
+        start = min(self._pos, len(self._view))
+        if size is None or size < 0:
+            end = len(self._view)
+        else:
+            end = min(start + size, len(self._view))
+        self._pos = max(self._pos, end)
+        return self._view[start:end].tobytes()
+
+    def readall(self) -> bytes:
+        return self.read()
+
+    def readinto(self, b: typing.Any) -> int:
+        start = min(self._pos, len(self._view))
+        end = min(start + len(b), len(self._view))
+        memoryview(b).cast("B")[: end - start] = self._view[start:end]
+        self._pos = max(self._pos, end)
+        return end - start
+
+    def close(self) -> None:
+        self._view = memoryview(b"")
+        super(_MemoryViewReader, self).close()
+
+
 class HTTPFile(ObjectDict):
     """Represents a file uploaded via a form.
 
@@ -663,9 +989,59 @@ class HTTPFile(ObjectDict):
     * ``filename``
     * ``body``
     * ``content_type``
+
+    Files parsed with ``zero_copy`` have a `memoryview` into the request
+    body as their ``body``. Files that were spilled to disk (see
+    ``spill_threshold`` in `parse_multipart_form_data` and
+    `MultipartFormDataParser`) have ``body`` set to ``None`` and a
+    ``file`` attribute holding a temporary file with the contents.
+    `open` and `iter_chunks` work the same way in all cases.
+
+    .. versionchanged:: 6.2
+       Added `open`, `iter_chunks` and `close`.
     """
 
-    pass
+    def open(self) -> typing.BinaryIO:
+        """Returns a binary file object positioned at the start of the
+        contents.
+
+        For spilled files this is the temporary file itself. A
+        `memoryview` body is not copied; the file reads from it directly.
+        """
+        file = self.get("file")
+        if file is not None:
+            file.seek(0)
+            return file
+        if isinstance(self.body, memoryview):
+            return typing.cast(typing.BinaryIO, _MemoryViewReader(self.body))
+        return io.BytesIO(self.body)
+
+    def iter_chunks(
+        self, chunk_size: int = 65536
+    ) -> Iterator[Union[bytes, memoryview]]:
+        """Yields the contents in pieces of at most ``chunk_size`` bytes,
+        e.g. to write them to a stream without holding another copy.
+
+        Pieces of a `memoryview` body are memoryviews as well.
+        """
+        file = self.get("file")
+        if file is not None:
+            file.seek(0)
+            while True:
+                chunk = file.read(chunk_size)
+                if not chunk:
+                    return
+                yield chunk
+        else:
+            body = self.body
+            for i in range(0, len(body), chunk_size):
+                yield body[i : i + chunk_size]
+
+    def close(self) -> None:
+        """Closes the temporary file of a spilled upload, if any."""
+        file = self.get("file")
+        if file is not None:
+            file.close()
 
 
 def _parse_request_range(
@@ -747,6 +1123,9 @@ def parse_body_arguments(
     arguments: Dict[str, List[bytes]],
     files: Dict[str, List[HTTPFile]],
     headers: Optional[HTTPHeaders] = None,
+    zero_copy: bool = False,
+    spill_threshold: Optional[int] = None,
+    tempdir: Optional[str] = None,
 ) -> None:
     """Parses a form request body.
 
@@ -755,6 +1134,13 @@ def parse_body_arguments(
     a string and ``body`` should be a byte string.  The ``arguments``
     and ``files`` parameters are dictionaries that will be updated
     with the parsed contents.
+
+    ``zero_copy``, ``spill_threshold`` and ``tempdir`` are passed to
+    `parse_multipart_form_data`.
+
+    .. versionchanged:: 6.2
+       Added the ``zero_copy``, ``spill_threshold`` and ``tempdir``
+       arguments.
     """
     if content_type.startswith("application/x-www-form-urlencoded"):
         if headers and "Content-Encoding" in headers:
@@ -782,7 +1168,15 @@ def parse_body_arguments(
             for field in fields:
                 k, sep, v = field.strip().partition("=")
                 if k == "boundary" and v:
-                    parse_multipart_form_data(utf8(v), body, arguments, files)
+                    parse_multipart_form_data(
+                        utf8(v),
+                        body,
+                        arguments,
+                        files,
+                        zero_copy=zero_copy,
+                        spill_threshold=spill_threshold,
+                        tempdir=tempdir,
+                    )
                     break
             else:
                 raise ValueError("multipart boundary not found")
@@ -795,6 +1189,9 @@ def parse_multipart_form_data(
     data: bytes,
     arguments: Dict[str, List[bytes]],
     files: Dict[str, List[HTTPFile]],
+    zero_copy: bool = False,
+    spill_threshold: Optional[int] = None,
+    tempdir: Optional[str] = None,
 ) -> None:
     """Parses a ``multipart/form-data`` body.
 
@@ -802,10 +1199,22 @@ def parse_multipart_form_data(
     The dictionaries given in the arguments and files parameters
     will be updated with the contents of the body.
 
+    Each value is copied out of ``data`` once. If ``zero_copy`` is true,
+    file bodies are instead `memoryview` slices of ``data`` (which must
+    then not be modified while they are in use). File bodies larger than
+    ``spill_threshold`` bytes are written to anonymous temporary files
+    (in ``tempdir``, if given); see `HTTPFile`. The caller should
+    `~HTTPFile.close` those when it is done with them.
+
     .. versionchanged:: 5.1
 
        Now recognizes non-ASCII filenames in RFC 2231/5987
        (``filename*=``) format.
+
+    .. versionchanged:: 6.2
+       Added the ``zero_copy``, ``spill_threshold`` and ``tempdir``
+       arguments. Parts are no longer copied out of ``data`` before
+       their values are.
     """
     # The standard allows for the boundary to be quoted in the header,
     # although it's rare (it happens at least for google app engine
@@ -818,34 +1227,294 @@ def parse_multipart_form_data(
     if final_boundary_index == -1:
         gen_log.warning("Invalid multipart/form-data: no final boundary")
         return
-    parts = data[:final_boundary_index].split(b"--" + boundary + b"\r\n")
-    for part in parts:
-        if not part:
+    # Walk the parts of data[:final_boundary_index] by position (as
+    # split() would delimit them) so that only the values get copied.
+    separator = b"--" + boundary + b"\r\n"
+    view = memoryview(data) if zero_copy else None
+    next_start = 0
+    while next_start >= 0:
+        start = next_start
+        end = data.find(separator, start, final_boundary_index)
+        if end == -1:
+            end = final_boundary_index
+            next_start = -1
+        else:
+            next_start = end + len(separator)
+        if start == end:
             continue
-        eoh = part.find(b"\r\n\r\n")
+        eoh = data.find(b"\r\n\r\n", start, end)
         if eoh == -1:
             gen_log.warning("multipart/form-data missing headers")
             continue
-        headers = HTTPHeaders.parse(part[:eoh].decode("utf-8"))
+        headers = HTTPHeaders.parse(data[start:eoh].decode("utf-8"))
         disp_header = headers.get("Content-Disposition", "")
         disposition, disp_params = _parse_header(disp_header)
-        if disposition != "form-data" or not part.endswith(b"\r\n"):
+        if disposition != "form-data" or data[end - 2 : end] != b"\r\n":
             gen_log.warning("Invalid multipart/form-data")
             continue
-        value = part[eoh + 4 : -2]
         if not disp_params.get("name"):
             gen_log.warning("multipart/form-data value missing name")
             continue
         name = disp_params["name"]
+        value_start, value_end = eoh + 4, max(eoh + 4, end - 2)
         if disp_params.get("filename"):
             ctype = headers.get("Content-Type", "application/unknown")
-            files.setdefault(name, []).append(
-                HTTPFile(
-                    filename=disp_params["filename"], body=value, content_type=ctype
+            file = HTTPFile(
+                filename=disp_params["filename"], body=None, content_type=ctype
+            )
+            if spill_threshold is not None and (
+                value_end - value_start > spill_threshold
+            ):
+                spill = tempfile.TemporaryFile(dir=tempdir)
+                spill.write(memoryview(data)[value_start:value_end])
+                spill.seek(0)
+                file.file = typing.cast(typing.BinaryIO, spill)
+            elif view is not None:
+                file.body = view[value_start:value_end]
+            else:
+                file.body = data[value_start:value_end]
+            files.setdefault(name, []).append(file)
+        else:
+            arguments.setdefault(name, []).append(data[value_start:value_end])
+
+
+class MultipartFormDataParser(HTTPMessageDelegate):
+    """Incrementally parses a ``multipart/form-data`` body.
+
+    This is an `HTTPMessageDelegate` that consumes the body as it
+    arrives in `data_received`, so the request never has to be held in
+    memory as a whole. Form fields are collected in ``arguments`` and
+    uploaded files in ``files``, as with `parse_multipart_form_data`;
+    both are only updated once the final boundary has been seen.
+
+    A file whose contents grow beyond ``spill_threshold`` bytes is
+    written to an anonymous temporary file (in ``tempdir``, if given)
+    instead of being kept in memory: its `HTTPFile` has ``body`` set to
+    ``None`` and ``file`` set to the temporary file, positioned at the
+    start. Smaller files have ``body`` set as usual and ``file`` set to
+    ``None``. The caller owns the temporary files and should close them
+    when it is done with them.
+
+    Plain form fields are always kept in memory, so a field longer than
+    ``max_field_size`` bytes makes `data_received` raise `HTTPInputError`
+    (as does a part whose headers exceed ``max_part_header_size``).
+
+    ``boundary`` is taken from the ``Content-Type`` passed to
+    `headers_received` when not given; when the parser is fed from
+    another delegate (e.g. a ``RequestHandler`` with
+    ``stream_request_body``), pass it explicitly and only call
+    `data_received` and `finish`.
+
+    .. versionadded:: 6.2
+    """
+
+    def __init__(
+        self,
+        boundary: Optional[bytes] = None,
+        arguments: Optional[Dict[str, List[bytes]]] = None,
+        files: Optional[Dict[str, List[HTTPFile]]] = None,
+        spill_threshold: int = 1024 * 1024,
+        tempdir: Optional[str] = None,
+        max_part_header_size: int = 65536,
+        max_field_size: int = 1024 * 1024,
+    ) -> None:
+        self.arguments = {} if arguments is None else arguments
+        self.files = {} if files is None else files
+        self.spill_threshold = spill_threshold
+        self.tempdir = tempdir
+        self.max_part_header_size = max_part_header_size
+        self.max_field_size = max_field_size
+        self._delimiter = b""
+        self._buffer = bytearray()
+        # One of "preamble", "boundary", "headers", "body", "done" or
+        # "error".
+        self._state = "preamble"
+        # The part being read: its name, HTTPFile (None for plain
+        # fields), and in-memory or spilled contents.
+        self._name = None  # type: Optional[str]
+        self._file = None  # type: Optional[HTTPFile]
+        self._value = bytearray()
+        self._spill = None  # type: Optional[typing.BinaryIO]
+        self._skip_part = False
+        self._parsed_arguments = []  # type: List[Tuple[str, bytes]]
+        self._parsed_files = []  # type: List[Tuple[str, HTTPFile]]
+        if boundary is not None:
+            self._set_boundary(boundary)
+
+    def _set_boundary(self, boundary: bytes) -> None:
+        # The standard allows for the boundary to be quoted in the header;
+        # see parse_multipart_form_data.
+        if boundary.startswith(b'"') and boundary.endswith(b'"'):
+            boundary = boundary[1:-1]
+        # Every boundary after the first is preceded by a CRLF that is not
+        # part of the previous value; prepending one to the body lets the
+        # first boundary be found the same way.
+        self._delimiter = b"\r\n--" + boundary
+        self._buffer += b"\r\n"
+
+    def headers_received(
+        self,
+        start_line: Union["RequestStartLine", "ResponseStartLine"],
+        headers: HTTPHeaders,
+    ) -> Optional[Awaitable[None]]:
+        if self._delimiter:
+            return None
+        if "Content-Encoding" in headers:
+            gen_log.warning(
+                "Unsupported Content-Encoding: %s", headers["Content-Encoding"]
+            )
+            self._state = "error"
+            return None
+        for field in headers.get("Content-Type", "").split(";"):
+            k, sep, v = field.strip().partition("=")
+            if k == "boundary" and v:
+                self._set_boundary(utf8(v))
+                break
+        else:
+            gen_log.warning("Invalid multipart/form-data: multipart boundary not found")
+            self._state = "error"
+        return None
+
+    def data_received(self, chunk: bytes) -> Optional[Awaitable[None]]:
+        if self._state in ("done", "error"):
+            return None
+        if not self._delimiter:
+            raise ValueError("multipart boundary not set")
+        self._buffer += chunk
+        try:
+            self._parse()
+        except Exception:
+            self._fail()
+            raise
+        return None
+
+    def finish(self) -> None:
+        if self._state == "done":
+            for name, value in self._parsed_arguments:
+                self.arguments.setdefault(name, []).append(value)
+            for name, file in self._parsed_files:
+                self.files.setdefault(name, []).append(file)
+        elif self._state != "error":
+            gen_log.warning("Invalid multipart/form-data: no final boundary")
+            self._fail()
+        self._parsed_arguments = []
+        self._parsed_files = []
+
+    def on_connection_close(self) -> None:
+        self._fail()
+
+    def _fail(self) -> None:
+        self._state = "error"
+        self._buffer = bytearray()
+        self._value = bytearray()
+        if self._spill is not None:
+            self._spill.close()
+            self._spill = None
+        for name, file in self._parsed_files:
+            if file.file is not None:
+                file.file.close()
+        self._parsed_arguments = []
+        self._parsed_files = []
+
+    def _parse(self) -> None:
+        buf = self._buffer
+        delimiter = self._delimiter
+        while True:
+            if self._state in ("preamble", "body"):
+                pos = buf.find(delimiter)
+                if pos < 0:
+                    # Keep enough to recognize a delimiter that straddles
+                    # this chunk and the next one.
+                    keep = len(delimiter) - 1
+                    if len(buf) > keep:
+                        if self._state == "body":
+                            self._write_value(memoryview(buf)[: len(buf) - keep])
+                        del buf[: len(buf) - keep]
+                    return
+                if self._state == "body":
+                    self._write_value(memoryview(buf)[:pos])
+                    self._finish_part()
+                del buf[: pos + len(delimiter)]
+                self._state = "boundary"
+            elif self._state == "boundary":
+                if len(buf) < 2:
+                    return
+                if buf[:2] == b"--":
+                    self._state = "done"
+                    del buf[:]
+                    return
+                if buf[:2] != b"\r\n":
+                    raise HTTPInputError("Invalid multipart/form-data boundary")
+                del buf[:2]
+                self._state = "headers"
+            elif self._state == "headers":
+                eoh = buf.find(b"\r\n\r\n")
+                if eoh < 0:
+                    if len(buf) > self.max_part_header_size:
+                        raise HTTPInputError("multipart/form-data headers too long")
+                    return
+                self._start_part(bytes(buf[:eoh]))
+                del buf[: eoh + 4]
+                self._state = "body"
+            else:
+                return
+
+    def _start_part(self, header_data: bytes) -> None:
+        headers = HTTPHeaders.parse(header_data.decode("utf-8"))
+        disp_header = headers.get("Content-Disposition", "")
+        disposition, disp_params = _parse_header(disp_header)
+        self._skip_part = True
+        if disposition != "form-data":
+            gen_log.warning("Invalid multipart/form-data")
+        elif not disp_params.get("name"):
+            gen_log.warning("multipart/form-data value missing name")
+        else:
+            self._skip_part = False
+            self._name = disp_params["name"]
+            if disp_params.get("filename"):
+                ctype = headers.get("Content-Type", "application/unknown")
+                self._file = HTTPFile(
+                    filename=disp_params["filename"],
+                    body=None,
+                    content_type=ctype,
+                    file=None,
                 )
+            else:
+                self._file = None
+
+    def _write_value(self, data: memoryview) -> None:
+        if self._skip_part or not data:
+            return
+        if self._spill is not None:
+            self._spill.write(data)
+            return
+        self._value += data
+        if self._file is None:
+            if len(self._value) > self.max_field_size:
+                raise HTTPInputError("multipart/form-data field too large")
+        elif len(self._value) > self.spill_threshold:
+            self._spill = typing.cast(
+                typing.BinaryIO, tempfile.TemporaryFile(dir=self.tempdir)
             )
+            self._spill.write(self._value)
+            self._value = bytearray()
+
+    def _finish_part(self) -> None:
+        if self._skip_part:
+            return
+        assert self._name is not None
+        if self._file is None:
+            self._parsed_arguments.append((self._name, bytes(self._value)))
         else:
-            arguments.setdefault(name, []).append(value)
+            if self._spill is not None:
+                self._spill.seek(0)
+                self._file.file = self._spill
+                self._spill = None
+            else:
+                self._file.body = bytes(self._value)
+            self._parsed_files.append((self._name, self._file))
+        self._name = self._file = None
+        self._value = bytearray()
 
 
 def format_timestamp(
@@ -1107,6 +1776,55 @@ def _unquote_cookie(s: str) -> str:
     return _nulljoin(res)
 
 
+# Clients resend the same Cookie header with every request, so parsed
+# headers are cached. Longer headers are parsed each time to bound the
+# memory held by the caches.
+_MAX_CACHED_COOKIE_LENGTH = 8192
+
+
+@lru_cache(256)
+def _parse_cookie_pairs(cookie: str) -> Tuple[Tuple[str, str], ...]:
+    cookiedict = {}
+    # Only quoted values need unquoting; skip the check per value when
+    # there are no quotes at all.
+    quoted = '"' in cookie
+    for chunk in cookie.split(";"):
+        if "=" in chunk:
+            key, val = chunk.split("=", 1)
+        else:
+            # Assume an empty name per
+            # https://bugzilla.mozilla.org/show_bug.cgi?id=169091
+            key, val = "", chunk
+        key, val = key.strip(), val.strip()
+        if key or val:
+            # unquote using Python's algorithm.
+            cookiedict[key] = _unquote_cookie(val) if quoted else val
+    return tuple(cookiedict.items())
+
+
+@lru_cache(256)
+def _build_cookie_morsels(cookie: str) -> http.cookies.SimpleCookie:
+    cookies = http.cookies.SimpleCookie()
+    for k, v in parse_cookie(cookie).items():
+        try:
+            cookies[k] = v
+        except Exception:
+            # SimpleCookie imposes some restrictions on keys;
+            # parse_cookie does not. Discard any cookies
+            # with disallowed keys.
+            pass
+    return cookies
+
+
+def _parse_cookie_morsels(cookie: str) -> http.cookies.SimpleCookie:
+    """Parses a ``Cookie`` header into a (possibly cached and shared)
+    `http.cookies.SimpleCookie`, which must not be modified.
+    """
+    if len(cookie) > _MAX_CACHED_COOKIE_LENGTH:
+        return _build_cookie_morsels.__wrapped__(cookie)  # type: ignore
+    return _build_cookie_morsels(cookie)
+
+
 def parse_cookie(cookie: str) -> Dict[str, str]:
     """Parse a ``Cookie`` HTTP header into a dict of name/value pairs.
 
@@ -1117,17 +1835,10 @@ def parse_cookie(cookie: str) -> Dict[str, str]:
     The algorithm used is identical to that used by Django version 1.9.10.
 
     .. versionadded:: 4.4.2
+
+    .. versionchanged:: 6.2
+       Results for recently seen headers are cached.
     """
-    cookiedict = {}
-    for chunk in cookie.split(str(";")):
-        if str("=") in chunk:
-            key, val = chunk.split(str("="), 1)
-        else:
-            # Assume an empty name per
-            # https://bugzilla.mozilla.org/show_bug.cgi?id=169091
-            key, val = str(""), chunk
-        key, val = key.strip(), val.strip()
-        if key or val:
-            # unquote using Python's algorithm.
-            cookiedict[key] = _unquote_cookie(val)
-    return cookiedict
+    if len(cookie) > _MAX_CACHED_COOKIE_LENGTH:
+        return dict(_parse_cookie_pairs.__wrapped__(cookie))  # type: ignore
+    return dict(_parse_cookie_pairs(cookie))
@@ -33,6 +33,8 @@ import socket
 import ssl
 import sys
 import re
+import weakref
+from functools import lru_cache
 
 from tornado.concurrent import Future, future_set_result_unless_cancelled
 from tornado import ioloop
@@ -40,6 +42,13 @@ from tornado.log import gen_log
 from tornado.netutil import ssl_wrap_socket, _client_ssl_defaults, _server_ssl_defaults
 from tornado.util import errno_from_exception
 
+# sre_parse was renamed to re._parser in Python 3.11 (and importing the
+# old name is deprecated there).
+if sys.version_info >= (3, 11):
+    from re import _parser as _sre_parse  # type: ignore
+else:
+    import sre_parse as _sre_parse
+
 import typing
 from typing import (
     Union,
@@ -51,6 +60,7 @@ from typing import (
     Dict,
     TypeVar,
     Tuple,
+    Sequence,
 )
 from types import TracebackType
 
@@ -80,6 +90,56 @@ if sys.platform == "darwin":
 
 _WINDOWS = sys.platform.startswith("win")
 
+# Maximum number of write buffer segments passed to a single
+# vectored write (well below IOV_MAX, which is 1024 on Linux).
+_MAX_WRITE_SEGMENTS = 64
+
+# Smallest chunk size used by streams with an adaptive read_chunk_size.
+_MIN_READ_CHUNK_SIZE = 4096
+
+
+@lru_cache(100)
+def _regex_max_width(regex: Pattern) -> Optional[int]:
+    """Returns the length of the longest possible match of ``regex``.
+
+    Returns None if the length is unbounded or cannot be determined, or
+    if whether a match succeeds can depend on data after the end of the
+    match (anchors, word boundaries and lookarounds).
+    """
+    def unsafe(pattern: Any) -> bool:
+        for op, av in pattern:
+            if op in (_sre_parse.AT, _sre_parse.ASSERT, _sre_parse.ASSERT_NOT):
+                return True
+            # Recurse into groups, branches and repeats.
+            items = av if isinstance(av, (tuple, list)) else [av]
+            for item in items:
+                if isinstance(item, list):
+                    subpatterns = item
+                else:
+                    subpatterns = [item]
+                for p in subpatterns:
+                    if isinstance(p, _sre_parse.SubPattern) and unsafe(p):
+                        return True
+        return False
+
+    try:
+        parsed = _sre_parse.parse(regex.pattern, regex.flags)
+        width = parsed.getwidth()[1]
+        if width >= _sre_parse.MAXREPEAT or unsafe(parsed):
+            return None
+    except Exception:
+        return None
+    return width
+
+
+def _remaining_file_size(fileobj: typing.BinaryIO, offset: int) -> int:
+    """Returns the number of bytes in ``fileobj`` after ``offset``."""
+    try:
+        size = os.fstat(fileobj.fileno()).st_size
+    except (AttributeError, io.UnsupportedOperation):
+        size = fileobj.seek(0, io.SEEK_END)
+    return max(0, size - offset)
+
 
 class StreamClosedError(IOError):
     """Exception raised by `IOStream` methods when the stream is closed.
@@ -176,6 +236,33 @@ class _StreamBuffer(object):
         else:
             return memoryview(b)[pos : pos + size]
 
+    def peek_segments(self, size: int, max_segments: int) -> "List[memoryview]":
+        """
+        Get views over at most ``size`` bytes (possibly fewer) at the
+        current buffer position, spread over at most ``max_segments``
+        of the underlying buffers.
+        """
+        assert size > 0 and max_segments > 0
+        segments = []  # type: List[memoryview]
+        pos = self._first_pos
+        for is_memview, b in self._buffers:
+            if is_memview:
+                view = typing.cast(memoryview, b[pos : pos + size])
+            else:
+                view = memoryview(b)[pos : pos + size]
+            segments.append(view)
+            size -= len(view)
+            pos = 0
+            if size <= 0 or len(segments) >= max_segments:
+                break
+        return segments
+
+    def segment_count(self) -> int:
+        """
+        Return the number of underlying buffers currently queued.
+        """
+        return len(self._buffers)
+
     def advance(self, size: int) -> None:
         """
         Advance the current buffer position by ``size`` bytes.
@@ -207,6 +294,107 @@ class _StreamBuffer(object):
         self._first_pos = pos
 
 
+class ReceiveBufferPool(object):
+    """A pool of reusable receive buffers shared by the streams of one
+    `.IOLoop`.
+
+    `BaseIOStream` reads from the socket into a scratch buffer before
+    appending the received bytes to its read buffer. Instead of
+    allocating a new ``read_chunk_size`` buffer for every read, streams
+    borrow one from the pool of their ``IOLoop`` and return it as soon
+    as the read is complete.
+
+    Buffers are allocated in the sizes given by ``size_classes``; a
+    request is served from the smallest class that is large enough, and
+    requests larger than every class get a one-off buffer. At most
+    ``max_bytes`` of idle buffers are retained.
+
+    Streams with an adaptive ``read_chunk_size`` only grow their chunk
+    size while the total growth of all such streams on the ``IOLoop``
+    stays within ``read_chunk_budget`` bytes. This bounds how large the
+    reads issued by those streams can get, not the memory they hold:
+    the receive buffers themselves come from the pool and are returned
+    after every read.
+
+    Use `install` to replace the default pool of an ``IOLoop`` before
+    any streams are created on it.
+
+    .. versionadded:: 6.2
+    """
+
+    def __init__(
+        self,
+        size_classes: Sequence[int] = (4096, 16384, 65536),
+        max_bytes: int = 4 * 1024 * 1024,
+        read_chunk_budget: int = 64 * 1024 * 1024,
+    ) -> None:
+        self.size_classes = sorted(size_classes)
+        self.max_bytes = max_bytes
+        self.read_chunk_budget = read_chunk_budget
+        self._reserved_bytes = 0
+        self._free = dict(
+            (size, []) for size in self.size_classes
+        )  # type: Dict[int, List[bytearray]]
+        self._free_bytes = 0
+
+    @classmethod
+    def _pools(cls) -> Dict[ioloop.IOLoop, "ReceiveBufferPool"]:
+        if not hasattr(cls, "_pool_dict"):
+            cls._pool_dict = weakref.WeakKeyDictionary()  # type: ignore
+        return cls._pool_dict  # type: ignore
+
+    @classmethod
+    def for_io_loop(cls, io_loop: ioloop.IOLoop) -> "ReceiveBufferPool":
+        """Returns the pool used by ``io_loop``, creating a default one
+        if necessary.
+        """
+        pools = cls._pools()
+        try:
+            return pools[io_loop]
+        except KeyError:
+            pool = pools[io_loop] = cls()
+            return pool
+
+    def install(self, io_loop: Optional[ioloop.IOLoop] = None) -> None:
+        """Makes this the pool used by streams created on ``io_loop``
+        (default: the current ``IOLoop``).
+        """
+        self._pools()[io_loop or ioloop.IOLoop.current()] = self
+
+    def acquire(self, size: int) -> bytearray:
+        """Returns a buffer of at least ``size`` bytes."""
+        for size_class in self.size_classes:
+            if size_class >= size:
+                free = self._free[size_class]
+                if free:
+                    self._free_bytes -= size_class
+                    return free.pop()
+                return bytearray(size_class)
+        return bytearray(size)
+
+    def release(self, buf: bytearray) -> None:
+        """Returns a buffer obtained from `acquire` to the pool."""
+        size = len(buf)
+        free = self._free.get(size)
+        if free is not None and self._free_bytes + size <= self.max_bytes:
+            free.append(buf)
+            self._free_bytes += size
+
+    def reserve(self, nbytes: int) -> bool:
+        """Reserves ``nbytes`` of the read chunk budget.
+
+        Returns False (and reserves nothing) if the budget is exhausted.
+        """
+        if self._reserved_bytes + nbytes > self.read_chunk_budget:
+            return False
+        self._reserved_bytes += nbytes
+        return True
+
+    def unreserve(self, nbytes: int) -> None:
+        """Returns ``nbytes`` obtained from `reserve` to the budget."""
+        self._reserved_bytes -= nbytes
+
+
 class BaseIOStream(object):
     """A utility class to write to and read from a non-blocking file or socket.
 
@@ -230,6 +418,7 @@ class BaseIOStream(object):
         max_buffer_size: Optional[int] = None,
         read_chunk_size: Optional[int] = None,
         max_write_buffer_size: Optional[int] = None,
+        adaptive_read_chunk_size: bool = False,
     ) -> None:
         """`BaseIOStream` constructor.
 
@@ -239,6 +428,13 @@ class BaseIOStream(object):
             underlying transport; defaults to 64KB.
         :arg max_write_buffer_size: Amount of outgoing data to buffer;
             defaults to unlimited.
+        :arg adaptive_read_chunk_size: If true, ``read_chunk_size`` is an
+            upper bound: the stream starts with small reads, doubles the
+            chunk size when reads keep filling it and halves it again
+            when reads come back mostly empty (as on idle keep-alive
+            connections), trading syscalls against buffer size. Growth
+            is limited by the ``read_chunk_budget`` of the
+            `ReceiveBufferPool`. See also `set_adaptive_read_chunk_size`.
 
         .. versionchanged:: 4.0
            Add the ``max_write_buffer_size`` parameter.  Changed default
@@ -246,13 +442,25 @@ class BaseIOStream(object):
         .. versionchanged:: 5.0
            The ``io_loop`` argument (deprecated since version 4.1) has been
            removed.
+        .. versionchanged:: 6.2
+           Added the ``adaptive_read_chunk_size`` parameter.
         """
         self.io_loop = ioloop.IOLoop.current()
         self.max_buffer_size = max_buffer_size or 104857600
         # A chunk size that is too close to max_buffer_size can cause
         # spurious failures.
         self.read_chunk_size = min(read_chunk_size or 65536, self.max_buffer_size // 2)
+        self._receive_pool = ReceiveBufferPool.for_io_loop(self.io_loop)
+        # In adaptive mode this is the upper bound for read_chunk_size,
+        # which then starts small (see _adapt_read_chunk_size).
+        self._max_read_chunk_size = None  # type: Optional[int]
+        self._full_reads = 0
+        if adaptive_read_chunk_size:
+            self.set_adaptive_read_chunk_size(True)
         self.max_write_buffer_size = max_write_buffer_size
+        self._write_high_watermark = None  # type: Optional[int]
+        self._write_low_watermark = 0
+        self._drain_futures = []  # type: List[Future[None]]
         self.error = None  # type: Optional[BaseException]
         self._read_buffer = bytearray()
         self._read_buffer_pos = 0
@@ -262,8 +470,14 @@ class BaseIOStream(object):
         self._write_buffer = _StreamBuffer()
         self._total_write_index = 0
         self._total_write_done_index = 0
+        self._write_syscalls = 0
         self._read_delimiter = None  # type: Optional[bytes]
         self._read_regex = None  # type: Optional[Pattern]
+        self._read_delimiters = None  # type: Optional[Tuple[bytes, ...]]
+        # Offset (relative to _read_buffer_pos) at which the next search
+        # for the pending delimiter or regex should start, so that data
+        # that has already been scanned is not scanned again.
+        self._read_scan_pos = 0
         self._read_max_bytes = None  # type: Optional[int]
         self._read_bytes = None  # type: Optional[int]
         self._read_partial = False
@@ -274,6 +488,8 @@ class BaseIOStream(object):
         )  # type: Deque[Tuple[int, Future[None]]]
         self._close_callback = None  # type: Optional[Callable[[], None]]
         self._connect_future = None  # type: Optional[Future[IOStream]]
+        # Resolves when the stream becomes writable; used by sendfile.
+        self._writable_future = None  # type: Optional[Future[None]]
         # _ssl_connect_future should be defined in SSLIOStream
         # but it's here so we can clean it up in _signal_closed
         # TODO: refactor that so subclasses can add additional futures
@@ -281,6 +497,7 @@ class BaseIOStream(object):
         self._ssl_connect_future = None  # type: Optional[Future[SSLIOStream]]
         self._connecting = False
         self._state = None  # type: Optional[int]
+        self._read_paused = False
         self._closed = False
 
     def fileno(self) -> Union[int, ioloop._Selectable]:
@@ -302,6 +519,27 @@ class BaseIOStream(object):
         """
         raise NotImplementedError()
 
+    def write_vectored_to_fd(self, data: "List[memoryview]") -> int:
+        """Attempts to write the buffers in ``data`` to the underlying
+        file with a single system call.
+
+        Returns the number of bytes written, which may end partway
+        through any of the buffers. The default implementation only
+        writes the first buffer with `write_to_fd`; subclasses that
+        support scatter/gather I/O should override it.
+        """
+        try:
+            return self.write_to_fd(data[0])
+        finally:
+            del data
+
+    def get_write_stats(self) -> Tuple[int, int]:
+        """Returns a tuple ``(syscalls, bytes)`` counting the write system
+        calls made by this stream and the number of bytes they have
+        flushed so far.
+        """
+        return self._write_syscalls, self._total_write_done_index
+
     def read_from_fd(self, buf: Union[bytearray, memoryview]) -> Optional[int]:
         """Attempts to read from the underlying file.
 
@@ -351,6 +589,7 @@ class BaseIOStream(object):
         """
         future = self._start_read()
         self._read_regex = re.compile(regex)
+        self._read_scan_pos = 0
         self._read_max_bytes = max_bytes
         try:
             self._try_inline_read()
@@ -366,6 +605,41 @@ class BaseIOStream(object):
             raise
         return future
 
+    def read_until_any(
+        self, delimiters: Sequence[bytes], max_bytes: Optional[int] = None
+    ) -> Awaitable[bytes]:
+        """Asynchronously read until we have found any of the given delimiters.
+
+        The result includes all the data read up to and including the
+        first delimiter found in the stream. If several delimiters start
+        at the same position, the one listed first wins.
+
+        This is a cheaper alternative to `read_until_regex` for patterns
+        that are just a choice between a few fixed strings, such as the
+        end of an HTTP header block.
+
+        If ``max_bytes`` is not None, the connection will be closed
+        if more than ``max_bytes`` bytes have been read and no delimiter
+        is found.
+
+        .. versionadded:: 6.2
+        """
+        future = self._start_read()
+        self._read_delimiters = tuple(delimiters)
+        self._read_scan_pos = 0
+        self._read_max_bytes = max_bytes
+        try:
+            self._try_inline_read()
+        except UnsatisfiableReadError as e:
+            # Handle this the same way as in _handle_events.
+            gen_log.info("Unsatisfiable read, closing connection: %s" % e)
+            self.close(exc_info=e)
+            return future
+        except:
+            future.add_done_callback(lambda f: f.exception())
+            raise
+        return future
+
     def read_until(
         self, delimiter: bytes, max_bytes: Optional[int] = None
     ) -> Awaitable[bytes]:
@@ -388,6 +662,7 @@ class BaseIOStream(object):
         """
         future = self._start_read()
         self._read_delimiter = delimiter
+        self._read_scan_pos = 0
         self._read_max_bytes = max_bytes
         try:
             self._try_inline_read()
@@ -508,6 +783,50 @@ class BaseIOStream(object):
             raise
         return future
 
+    def read_until_nowait(
+        self, delimiter: bytes, max_bytes: Optional[int] = None
+    ) -> Optional[bytes]:
+        """Synchronously reads up to and including ``delimiter`` if it is
+        already in the read buffer.
+
+        Returns ``None``, without consuming anything, if the delimiter is
+        not found within the first ``max_bytes`` buffered bytes. This lets
+        parsers consume data that has already arrived without creating a
+        `.Future` per read, falling back to `read_until` (which also
+        handles ``max_bytes`` errors) when this returns ``None``. It must
+        not be called while another read is pending.
+
+        .. versionadded:: 6.2
+        """
+        assert self._read_future is None, "Already reading"
+        start = self._read_buffer_pos
+        end = start + self._read_buffer_size
+        if max_bytes is not None:
+            end = min(end, start + max_bytes)
+        loc = self._read_buffer.find(delimiter, start, end)
+        if loc == -1:
+            return None
+        return self._consume(loc - start + len(delimiter))
+
+    def read_bytes_nowait(
+        self, num_bytes: int, partial: bool = False
+    ) -> Optional[bytes]:
+        """Synchronously reads ``num_bytes`` from the read buffer.
+
+        Returns ``None``, without consuming anything, if fewer bytes are
+        buffered; with ``partial``, returns up to ``num_bytes`` if any are
+        buffered. See `read_until_nowait`.
+
+        .. versionadded:: 6.2
+        """
+        assert self._read_future is None, "Already reading"
+        available = self._read_buffer_size
+        if available >= num_bytes:
+            return self._consume(num_bytes)
+        if partial and available:
+            return self._consume(available)
+        return None
+
     def write(self, data: Union[bytes, memoryview]) -> "Future[None]":
         """Asynchronously write the given data to this stream.
 
@@ -548,6 +867,99 @@ class BaseIOStream(object):
             self._maybe_add_error_listener()
         return future
 
+    async def sendfile(
+        self, fileobj: typing.BinaryIO, offset: int = 0, count: Optional[int] = None
+    ) -> int:
+        """Asynchronously write ``count`` bytes of ``fileobj``, starting at
+        ``offset``, to this stream.
+
+        If ``count`` is None, everything from ``offset`` to the end of
+        the file is sent. Returns the number of bytes sent, which is
+        less than ``count`` only if the file ended first.
+
+        Data passed to `write` earlier is sent first. No other writes
+        may be started until the returned awaitable has resolved.
+
+        This implementation copies the file through the write buffer in
+        ``read_chunk_size`` pieces; `IOStream` overrides it to let the
+        kernel send the file with `os.sendfile` where possible.
+
+        .. versionadded:: 6.2
+        """
+        if count is None:
+            count = _remaining_file_size(fileobj, offset)
+        fileobj.seek(offset)
+        sent = 0
+        while sent < count:
+            chunk = fileobj.read(min(count - sent, self.read_chunk_size))
+            if not chunk:
+                break
+            await self.write(chunk)
+            sent += len(chunk)
+        return sent
+
+    def set_write_watermarks(
+        self, high: Optional[int] = None, low: Optional[int] = None
+    ) -> None:
+        """Sets the write buffer watermarks used for flow control.
+
+        Once more than ``high`` bytes are waiting in the write buffer,
+        `write_buffer_above_high_watermark` returns true until the
+        buffer has drained down to ``low`` bytes (default: a quarter of
+        ``high``). Producers can use this together with `drain` to pause
+        instead of buffering without limit for a slow reader.
+
+        Passing ``high=None`` disables the watermarks; `drain` then waits
+        for the write buffer to be empty.
+
+        .. versionadded:: 6.2
+        """
+        if high is None:
+            self._write_high_watermark = None
+            self._write_low_watermark = 0
+        else:
+            if low is None:
+                low = high // 4
+            if not 0 <= low <= high:
+                raise ValueError("need 0 <= low <= high watermark")
+            self._write_high_watermark = high
+            self._write_low_watermark = low
+
+    def write_buffer_above_high_watermark(self) -> bool:
+        """Returns ``True`` if more than the high watermark's worth of data
+        is waiting to be written (see `set_write_watermarks`).
+
+        .. versionadded:: 6.2
+        """
+        return (
+            self._write_high_watermark is not None
+            and self._write_buffer is not None
+            and len(self._write_buffer) > self._write_high_watermark
+        )
+
+    def drain(self) -> "Future[None]":
+        """Returns a `.Future` that resolves once the write buffer holds no
+        more than the low watermark's worth of data (see
+        `set_write_watermarks`).
+
+        .. versionadded:: 6.2
+        """
+        self._check_closed()
+        future = Future()  # type: Future[None]
+        if len(self._write_buffer) <= self._write_low_watermark:
+            future.set_result(None)
+        else:
+            self._drain_futures.append(future)
+        return future
+
+    def _wait_for_writable(self) -> "Future[None]":
+        """Returns a `.Future` that resolves once the write buffer is empty
+        and the underlying file can accept more data.
+        """
+        future = self._writable_future = Future()
+        self._add_io_state(ioloop.IOLoop.WRITE)
+        return future
+
     def set_close_callback(self, callback: Optional[Callable[[], None]]) -> None:
         """Call the given callback when the stream is closed.
 
@@ -609,6 +1021,8 @@ class BaseIOStream(object):
                 self._state = None
             self.close_fd()
             self._closed = True
+            if self._max_read_chunk_size is not None:
+                self._reset_read_chunk_size()
         self._signal_closed()
 
     def _signal_closed(self) -> None:
@@ -618,6 +1032,11 @@ class BaseIOStream(object):
             self._read_future = None
         futures += [future for _, future in self._write_futures]
         self._write_futures.clear()
+        if self._writable_future is not None:
+            futures.append(self._writable_future)
+            self._writable_future = None
+        futures += self._drain_futures
+        self._drain_futures = []
         if self._connect_future is not None:
             futures.append(self._connect_future)
             self._connect_future = None
@@ -656,12 +1075,67 @@ class BaseIOStream(object):
 
     def writing(self) -> bool:
         """Returns ``True`` if we are currently writing to the stream."""
-        return bool(self._write_buffer)
+        return bool(self._write_buffer) or self._writable_future is not None
 
     def closed(self) -> bool:
         """Returns ``True`` if the stream has been closed."""
         return self._closed
 
+    def pause_reading(self) -> None:
+        """Stops reading from the underlying file until `resume_reading`
+        is called.
+
+        Reads may still be started and will be satisfied from data that
+        is already buffered, but no more data is read from the socket,
+        so a fast sender is throttled by TCP flow control instead of
+        filling our buffers. Closed connections are not detected while
+        reading is paused.
+
+        .. versionadded:: 6.2
+        """
+        # The READ interest is dropped lazily by _handle_events, so
+        # pausing and resuming without an intervening event is free.
+        self._read_paused = True
+
+    def resume_reading(self) -> None:
+        """Undoes `pause_reading`.
+
+        .. versionadded:: 6.2
+        """
+        if not self._read_paused:
+            return
+        self._read_paused = False
+        if self.closed():
+            return
+        if self.reading():
+            # Read directly instead of waiting for the IOLoop: SSL
+            # sockets may hold buffered data that select() can't see.
+            try:
+                self._handle_read()
+            except UnsatisfiableReadError as e:
+                gen_log.info("Unsatisfiable read, closing connection: %s" % e)
+                self.close(exc_info=e)
+                return
+            if self.reading():
+                self._add_io_state(ioloop.IOLoop.READ)
+        else:
+            self._maybe_add_error_listener()
+
+    def reading_paused(self) -> bool:
+        """Returns ``True`` if reading has been paused with `pause_reading`.
+
+        .. versionadded:: 6.2
+        """
+        return self._read_paused
+
+    def read_buffer_size(self) -> int:
+        """Returns the number of bytes that have been received but not
+        yet returned by a read.
+
+        .. versionadded:: 6.2
+        """
+        return self._read_buffer_size
+
     def set_nodelay(self, value: bool) -> None:
         """Sets the no-delay flag for this stream.
 
@@ -693,7 +1167,7 @@ class BaseIOStream(object):
                 self._handle_connect()
             if self.closed():
                 return
-            if events & self.io_loop.READ:
+            if events & self.io_loop.READ and not self._read_paused:
                 self._handle_read()
             if self.closed():
                 return
@@ -709,11 +1183,15 @@ class BaseIOStream(object):
                 self.io_loop.add_callback(self.close)
                 return
             state = self.io_loop.ERROR
-            if self.reading():
+            if self.reading() and not self._read_paused:
                 state |= self.io_loop.READ
             if self.writing():
                 state |= self.io_loop.WRITE
-            if state == self.io_loop.ERROR and self._read_buffer_size == 0:
+            if (
+                state == self.io_loop.ERROR
+                and self._read_buffer_size == 0
+                and not self._read_paused
+            ):
                 # If the connection is idle, listen for reads too so
                 # we can tell if the connection is closed.  If there is
                 # data in the read buffer we won't run the close callback
@@ -842,6 +1320,9 @@ class BaseIOStream(object):
             self._read_from_buffer(pos)
             return
         self._check_closed()
+        if self._read_paused:
+            # resume_reading will pick this read up again.
+            return
         pos = self._read_to_buffer_loop()
         if pos is not None:
             self._read_from_buffer(pos)
@@ -859,6 +1340,7 @@ class BaseIOStream(object):
         to read (i.e. the read returns EWOULDBLOCK or equivalent).  On
         error closes the socket and raises an exception.
         """
+        pool_buf = None  # type: Optional[bytearray]
         try:
             while True:
                 try:
@@ -867,7 +1349,10 @@ class BaseIOStream(object):
                             self._read_buffer_size :
                         ]  # type: Union[memoryview, bytearray]
                     else:
-                        buf = bytearray(self.read_chunk_size)
+                        # Borrow a scratch buffer from the IOLoop's pool
+                        # instead of allocating a new chunk for every read.
+                        pool_buf = self._receive_pool.acquire(self.read_chunk_size)
+                        buf = memoryview(pool_buf)[: self.read_chunk_size]
                     bytes_read = self.read_from_fd(buf)
                 except (socket.error, IOError, OSError) as e:
                     # ssl.SSLError is a subclass of socket.error
@@ -887,17 +1372,94 @@ class BaseIOStream(object):
                 return 0
             if not self._user_read_buffer:
                 self._read_buffer += memoryview(buf)[:bytes_read]
+                if self._max_read_chunk_size is not None:
+                    self._adapt_read_chunk_size(bytes_read)
             self._read_buffer_size += bytes_read
         finally:
             # Break the reference to buf so we don't waste a chunk's worth of
             # memory in case an exception hangs on to our stack frame.
             del buf
+            if pool_buf is not None:
+                self._receive_pool.release(pool_buf)
+                del pool_buf
         if self._read_buffer_size > self.max_buffer_size:
             gen_log.error("Reached maximum read buffer size")
             self.close()
             raise StreamBufferFullError("Reached maximum read buffer size")
         return bytes_read
 
+    def _adapt_read_chunk_size(self, bytes_read: int) -> None:
+        assert self._max_read_chunk_size is not None
+        if bytes_read >= self.read_chunk_size:
+            # Two full reads in a row suggest a bulk transfer; fewer,
+            # larger reads will drain the socket with fewer syscalls.
+            self._full_reads += 1
+            if (
+                self._full_reads >= 2
+                and self.read_chunk_size < self._max_read_chunk_size
+            ):
+                self._full_reads = 0
+                self._resize_read_chunk(
+                    min(self.read_chunk_size * 2, self._max_read_chunk_size)
+                )
+        else:
+            self._full_reads = 0
+            if (
+                bytes_read <= self.read_chunk_size // 4
+                and self.read_chunk_size > _MIN_READ_CHUNK_SIZE
+            ):
+                self._resize_read_chunk(
+                    max(self.read_chunk_size // 2, _MIN_READ_CHUNK_SIZE)
+                )
+
+    def _resize_read_chunk(self, size: int) -> None:
+        delta = size - self.read_chunk_size
+        if delta > 0:
+            if not self._receive_pool.reserve(delta):
+                return
+        else:
+            self._receive_pool.unreserve(-delta)
+        self.read_chunk_size = size
+
+    def set_adaptive_read_chunk_size(self, adaptive: bool) -> None:
+        """Turns the ``adaptive_read_chunk_size`` mode (see the
+        constructor) on or off.
+
+        This is useful for streams that are created elsewhere, such as
+        the ones accepted by a `.TCPServer`. The current
+        ``read_chunk_size`` becomes the upper bound when the mode is
+        turned on and is restored when it is turned off.
+
+        .. versionadded:: 6.2
+        """
+        if adaptive and self._max_read_chunk_size is None:
+            self._max_read_chunk_size = self.read_chunk_size
+            self._full_reads = 0
+            self.read_chunk_size = min(_MIN_READ_CHUNK_SIZE, self.read_chunk_size)
+        elif not adaptive and self._max_read_chunk_size is not None:
+            self._reset_read_chunk_size()
+            self.read_chunk_size = self._max_read_chunk_size
+            self._max_read_chunk_size = None
+
+    def reset_read_chunk_size(self) -> None:
+        """Shrinks an adaptive ``read_chunk_size`` back to its minimum.
+
+        Call this when the stream goes idle (for example, a server
+        connection waiting for its next request) so that its next reads
+        are small again and its growth stops counting against the read
+        chunk budget. Does nothing unless the adaptive mode is on (see
+        `set_adaptive_read_chunk_size`).
+
+        .. versionadded:: 6.2
+        """
+        if self._max_read_chunk_size is not None:
+            self._reset_read_chunk_size()
+
+    def _reset_read_chunk_size(self) -> None:
+        assert self._max_read_chunk_size is not None
+        self._full_reads = 0
+        self._resize_read_chunk(min(_MIN_READ_CHUNK_SIZE, self._max_read_chunk_size))
+
     def _read_from_buffer(self, pos: int) -> None:
         """Attempts to complete the currently-pending read from the buffer.
 
@@ -905,6 +1467,7 @@ class BaseIOStream(object):
         as returned by _find_read_pos.
         """
         self._read_bytes = self._read_delimiter = self._read_regex = None
+        self._read_delimiters = None
         self._read_partial = False
         self._finish_read(pos, False)
 
@@ -932,25 +1495,64 @@ class BaseIOStream(object):
             # _consume().
             if self._read_buffer:
                 loc = self._read_buffer.find(
-                    self._read_delimiter, self._read_buffer_pos
+                    self._read_delimiter, self._read_buffer_pos + self._read_scan_pos
                 )
+                delimiter_len = len(self._read_delimiter)
                 if loc != -1:
                     loc -= self._read_buffer_pos
-                    delimiter_len = len(self._read_delimiter)
                     self._check_max_bytes(self._read_delimiter, loc + delimiter_len)
                     return loc + delimiter_len
+                # Only the last few bytes can hold the start of a
+                # delimiter that straddles the end of the buffer; skip
+                # everything before them on the next search.
+                self._read_scan_pos = max(
+                    0, self._read_buffer_size - delimiter_len + 1
+                )
                 self._check_max_bytes(self._read_delimiter, self._read_buffer_size)
         elif self._read_regex is not None:
             if self._read_buffer:
-                m = self._read_regex.search(self._read_buffer, self._read_buffer_pos)
+                m = self._read_regex.search(
+                    self._read_buffer, self._read_buffer_pos + self._read_scan_pos
+                )
                 if m is not None:
                     loc = m.end() - self._read_buffer_pos
                     self._check_max_bytes(self._read_regex, loc)
                     return loc
+                # As above, but only for regexes whose matches have a
+                # known maximum length; others are rescanned in full.
+                width = _regex_max_width(self._read_regex)
+                if width is not None:
+                    self._read_scan_pos = max(0, self._read_buffer_size - width + 1)
                 self._check_max_bytes(self._read_regex, self._read_buffer_size)
+        elif self._read_delimiters is not None:
+            if self._read_buffer:
+                start = self._read_buffer_pos + self._read_scan_pos
+                loc = -1
+                delimiter_len = 0
+                for delimiter in self._read_delimiters:
+                    if loc == -1:
+                        pos = self._read_buffer.find(delimiter, start)
+                    else:
+                        # Only look for matches that start before the
+                        # best one found so far.
+                        pos = self._read_buffer.find(
+                            delimiter, start, loc - 1 + len(delimiter)
+                        )
+                    if pos != -1:
+                        loc = pos
+                        delimiter_len = len(delimiter)
+                if loc != -1:
+                    loc -= self._read_buffer_pos
+                    self._check_max_bytes(self._read_delimiters, loc + delimiter_len)
+                    return loc + delimiter_len
+                longest = max(len(d) for d in self._read_delimiters)
+                self._read_scan_pos = max(0, self._read_buffer_size - longest + 1)
+                self._check_max_bytes(self._read_delimiters, self._read_buffer_size)
         return None
 
-    def _check_max_bytes(self, delimiter: Union[bytes, Pattern], size: int) -> None:
+    def _check_max_bytes(
+        self, delimiter: Union[bytes, Pattern, Sequence[bytes]], size: int
+    ) -> None:
         if self._read_max_bytes is not None and size > self._read_max_bytes:
             raise UnsatisfiableReadError(
                 "delimiter %r not found within %d bytes"
@@ -972,7 +1574,15 @@ class BaseIOStream(object):
                     # with more than 128KB at a time.
                     size = 128 * 1024
 
-                num_bytes = self.write_to_fd(self._write_buffer.peek(size))
+                self._write_syscalls += 1
+                if self._write_buffer.segment_count() > 1:
+                    # Flush several queued buffers with one system call
+                    # instead of one call per buffer.
+                    num_bytes = self.write_vectored_to_fd(
+                        self._write_buffer.peek_segments(size, _MAX_WRITE_SEGMENTS)
+                    )
+                else:
+                    num_bytes = self.write_to_fd(self._write_buffer.peek(size))
                 if num_bytes == 0:
                     break
                 self._write_buffer.advance(num_bytes)
@@ -995,6 +1605,20 @@ class BaseIOStream(object):
             self._write_futures.popleft()
             future_set_result_unless_cancelled(future, None)
 
+        if (
+            self._drain_futures
+            and len(self._write_buffer) <= self._write_low_watermark
+        ):
+            drain_futures = self._drain_futures
+            self._drain_futures = []
+            for future in drain_futures:
+                future_set_result_unless_cancelled(future, None)
+
+        if self._writable_future is not None and not self._write_buffer:
+            future = self._writable_future
+            self._writable_future = None
+            future_set_result_unless_cancelled(future, None)
+
     def _consume(self, loc: int) -> bytes:
         # Consume loc bytes from the read buffer and return them
         if loc == 0:
@@ -1032,6 +1656,7 @@ class BaseIOStream(object):
                 not self.closed()
                 and self._read_buffer_size == 0
                 and self._close_callback is not None
+                and not self._read_paused
             ):
                 self._add_io_state(ioloop.IOLoop.READ)
 
@@ -1155,6 +1780,63 @@ class IOStream(BaseIOStream):
             # See https://github.com/tornadoweb/tornado/pull/2008
             del data
 
+    def write_vectored_to_fd(self, data: "List[memoryview]") -> int:
+        if not hasattr(self.socket, "sendmsg"):
+            # Windows sockets have no sendmsg.
+            return super(IOStream, self).write_vectored_to_fd(data)
+        try:
+            return self.socket.sendmsg(data)
+        finally:
+            del data
+
+    async def sendfile(
+        self, fileobj: typing.BinaryIO, offset: int = 0, count: Optional[int] = None
+    ) -> int:
+        try:
+            in_fd = fileobj.fileno()
+        except (AttributeError, io.UnsupportedOperation):
+            in_fd = None
+        if in_fd is None or not hasattr(os, "sendfile"):
+            return await super(IOStream, self).sendfile(fileobj, offset, count)
+        if count is None:
+            count = _remaining_file_size(fileobj, offset)
+        # Flush anything written before the file.
+        await self.write(b"")
+        sent = 0
+        while sent < count:
+            self._check_closed()
+            try:
+                self._write_syscalls += 1
+                num_bytes = os.sendfile(
+                    self.socket.fileno(), in_fd, offset + sent, count - sent
+                )
+            except BlockingIOError:
+                await self._wait_for_writable()
+                continue
+            except (socket.error, IOError, OSError) as e:
+                if sent == 0 and errno_from_exception(e) in (
+                    errno.EINVAL,
+                    errno.ENOSYS,
+                ):
+                    # This kind of file (or socket) is not supported by
+                    # sendfile(2); fall back to copying.
+                    return await super(IOStream, self).sendfile(
+                        fileobj, offset, count
+                    )
+                if not self._is_connreset(e):
+                    gen_log.warning("Write error on %s: %s", self.fileno(), e)
+                self.close(exc_info=e)
+                raise StreamClosedError(real_error=e)
+            if num_bytes == 0:
+                # The file is shorter than expected.
+                break
+            sent += num_bytes
+            # Keep the write indices in step so that futures for later
+            # writes resolve at the right time.
+            self._total_write_index += num_bytes
+            self._total_write_done_index += num_bytes
+        return sent
+
     def connect(
         self: _IOStreamType, address: Any, server_hostname: Optional[str] = None
     ) -> "Future[_IOStreamType]":
@@ -1296,6 +1978,11 @@ class IOStream(BaseIOStream):
         ssl_stream.set_close_callback(orig_close_callback)
         ssl_stream._ssl_connect_future = future
         ssl_stream.max_buffer_size = self.max_buffer_size
+        if self._max_read_chunk_size is not None:
+            # Hand the adaptive state over without leaking our share of
+            # the read chunk budget.
+            self._reset_read_chunk_size()
+            ssl_stream._max_read_chunk_size = self._max_read_chunk_size
         ssl_stream.read_chunk_size = self.read_chunk_size
         return future
 
@@ -1585,6 +2272,17 @@ class SSLIOStream(IOStream):
             # See https://github.com/tornadoweb/tornado/pull/2008
             del data
 
+    def write_vectored_to_fd(self, data: "List[memoryview]") -> int:
+        # SSLSocket does not implement sendmsg, so write one buffer at a time.
+        return BaseIOStream.write_vectored_to_fd(self, data)
+
+    async def sendfile(
+        self, fileobj: typing.BinaryIO, offset: int = 0, count: Optional[int] = None
+    ) -> int:
+        # os.sendfile would bypass encryption, so copy the file through
+        # the write buffer instead.
+        return await BaseIOStream.sendfile(self, fileobj, offset, count)
+
     def read_from_fd(self, buf: Union[bytearray, memoryview]) -> Optional[int]:
         try:
             if self._ssl_accepting:
@@ -15,6 +15,7 @@
 
 """Miscellaneous network utility code."""
 
+import collections
 import concurrent.futures
 import errno
 import os
@@ -22,6 +23,7 @@ import sys
 import socket
 import ssl
 import stat
+import typing
 
 from tornado.concurrent import dummy_executor, run_on_executor
 from tornado.ioloop import IOLoop
@@ -29,6 +31,9 @@ from tornado.util import Configurable, errno_from_exception
 
 from typing import List, Callable, Any, Type, Dict, Union, Tuple, Awaitable, Optional
 
+if typing.TYPE_CHECKING:
+    from typing import Deque  # noqa: F401
+
 # Note that the naming of ssl.Purpose is confusing; the purpose
 # of a context is to authentiate the opposite side of the connection.
 _client_ssl_defaults = ssl.create_default_context(ssl.Purpose.SERVER_AUTH)
@@ -223,8 +228,31 @@ if hasattr(socket, "AF_UNIX"):
         return sock
 
 
+class AcceptStats(object):
+    """Counters maintained by `add_accept_handler` in batched mode.
+
+    ``accepted`` is the number of connections taken from the listen
+    backlog, ``dispatched`` the number passed to the callback so far,
+    ``deferred`` counts each time a connection had to wait for a later
+    `.IOLoop` iteration because the batch or time budget was used up,
+    and ``batches`` is the number of dispatch rounds.
+
+    .. versionadded:: 6.2
+    """
+
+    def __init__(self) -> None:
+        self.accepted = 0
+        self.dispatched = 0
+        self.deferred = 0
+        self.batches = 0
+
+
 def add_accept_handler(
-    sock: socket.socket, callback: Callable[[socket.socket, Any], None]
+    sock: socket.socket,
+    callback: Callable[[socket.socket, Any], None],
+    batch_size: Optional[int] = None,
+    time_budget: float = 0.005,
+    stats: Optional[AcceptStats] = None,
 ) -> Callable[[], None]:
     """Adds an `.IOLoop` event handler to accept new connections on ``sock``.
 
@@ -237,14 +265,29 @@ def add_accept_handler(
     A callable is returned which, when called, will remove the `.IOLoop`
     event handler and stop processing further incoming connections.
 
+    If ``batch_size`` is given, connections are accepted in batched mode:
+    the listen backlog is drained first, and the callbacks are then run
+    at most ``batch_size`` at a time and for no longer than
+    ``time_budget`` seconds per `.IOLoop` iteration. Connections left
+    over are dispatched on the next iteration, so a burst of new
+    connections cannot starve the ones already being served. Pass an
+    `AcceptStats` as ``stats`` to collect counters.
+
     .. versionchanged:: 5.0
        The ``io_loop`` argument (deprecated since version 4.1) has been removed.
 
     .. versionchanged:: 5.0
        A callable is returned (``None`` was returned before).
+
+    .. versionchanged:: 6.2
+       Added the ``batch_size``, ``time_budget`` and ``stats`` arguments.
     """
     io_loop = IOLoop.current()
     removed = [False]
+    if batch_size is not None:
+        return _add_batched_accept_handler(
+            sock, callback, batch_size, time_budget, stats or AcceptStats()
+        )
 
     def accept_handler(fd: socket.socket, events: int) -> None:
         # More connections may come in while we're handling callbacks;
@@ -286,6 +329,79 @@ def add_accept_handler(
     return remove_handler
 
 
+def _add_batched_accept_handler(
+    sock: socket.socket,
+    callback: Callable[[socket.socket, Any], None],
+    batch_size: int,
+    time_budget: float,
+    stats: AcceptStats,
+) -> Callable[[], None]:
+    io_loop = IOLoop.current()
+    removed = [False]
+    # Accepted connections waiting for their callback. While this is full
+    # we stop listening on the socket and leave further connections in
+    # the kernel backlog (where other processes sharing the socket can
+    # still pick them up).
+    pending = collections.deque()  # type: Deque[Tuple[socket.socket, Any]]
+    max_pending = max(batch_size, _DEFAULT_BACKLOG)
+    state = {"listening": True, "scheduled": False}
+
+    def accept_handler(fd: socket.socket, events: int) -> None:
+        while len(pending) < max_pending:
+            try:
+                connection, address = sock.accept()
+            except BlockingIOError:
+                break
+            except ConnectionAbortedError:
+                continue
+            stats.accepted += 1
+            pending.append((connection, address))
+        if len(pending) >= max_pending and state["listening"]:
+            io_loop.update_handler(sock, 0)
+            state["listening"] = False
+        # Only one batch runs per IOLoop iteration: if one already ran
+        # (or is scheduled), the scheduled dispatch picks these up.
+        if not state["scheduled"]:
+            dispatch()
+
+    def scheduled_dispatch() -> None:
+        state["scheduled"] = False
+        if pending:
+            dispatch()
+
+    def dispatch() -> None:
+        if removed[0]:
+            return
+        stats.batches += 1
+        deadline = io_loop.time() + time_budget
+        for i in range(batch_size):
+            if not pending or removed[0]:
+                break
+            connection, address = pending.popleft()
+            stats.dispatched += 1
+            callback(connection, address)
+            if io_loop.time() >= deadline:
+                break
+        if removed[0]:
+            return
+        if pending:
+            stats.deferred += len(pending)
+        elif not state["listening"]:
+            io_loop.update_handler(sock, IOLoop.READ)
+            state["listening"] = True
+        state["scheduled"] = True
+        io_loop.add_callback(scheduled_dispatch)
+
+    def remove_handler() -> None:
+        io_loop.remove_handler(sock)
+        removed[0] = True
+        while pending:
+            pending.popleft()[0].close()
+
+    io_loop.add_handler(sock, accept_handler, IOLoop.READ)
+    return remove_handler
+
+
 def is_valid_ip(ip: str) -> bool:
     """Returns ``True`` if the given string is a well-formed IP address.
 